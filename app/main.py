@@ -6,24 +6,32 @@ import time
 from pathlib import Path
 
 from fastapi import FastAPI, UploadFile, File, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import (
     HTMLResponse,
     FileResponse,
     RedirectResponse,
-    JSONResponse,
+    ORJSONResponse,
 )
 
 from .pipeline import JobStore, process_job
 
 store = JobStore()
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+# The organizer/TOC pages and toc-data JSON are large and very repetitive;
+# level 5 keeps most of level 9's ratio for a fraction of the CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 STATIC_DIR = REPO_ROOT / "static"
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+# Scripts under /static/js/ carry a version in their filename (foo.v1.js),
+# so browsers may keep them forever; bump the version when the file changes.
+IMMUTABLE_STATIC_PREFIX = "/static/js/"
+
 
 # ---------------------------
 # No-cache middleware (important on Render + phones)
@@ -31,6 +39,9 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 @app.middleware("http")
 async def no_cache_mw(request, call_next):
     resp = await call_next(request)
+    if request.url.path.startswith(IMMUTABLE_STATIC_PREFIX) and resp.status_code == 200:
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return resp
     # Avoid stale status/progress + stale PDFs/HTML behind mobile caches
     resp.headers["Cache-Control"] = "no-store"
     resp.headers["Pragma"] = "no-cache"
@@ -581,22 +592,19 @@ async def upload(
 # ---------------------------
 # Status endpoint for polling (no refresh needed)
 # ---------------------------
-@app.get("/job/{jid}/status")
+@app.get("/job/{jid}/status", response_class=ORJSONResponse)
 def job_status(jid: str):
     j = store.get(jid)
     if j.get("status") == "missing":
-        return JSONResponse({"status": "missing"}, status_code=404)
+        return ORJSONResponse({"status": "missing"}, status_code=404)
 
-    progress_percent, stage_text = store.compute_progress_percent(jid)
+    progress_percent, stage_text = store.compute_progress_percent(jid, j)
     progress = j.get("progress") or {}
     last_reported = progress.get("last_reported_percent") or 0
     if progress_percent > last_reported and j.get("status") != "done":
         store.set_progress(jid, {"last_reported_percent": progress_percent})
 
-    job_dir = store.path(jid)
-    out_pdf = job_dir / "STACKED.pdf"
-    out_xlsx = job_dir / "Bags_with_Overflow.xlsx"
-    out_html = job_dir / "van_organizer.html"
+    outputs = store.outputs_present(jid)
 
     return {
         "status": j.get("status", ""),
@@ -605,9 +613,9 @@ def job_status(jid: str):
         "progress": j.get("progress") or {},
         "progress_percent": progress_percent,
         "stage_text": stage_text,
-        "has_pdf": out_pdf.exists(),
-        "has_xlsx": out_xlsx.exists(),
-        "has_html": out_html.exists(),
+        "has_pdf": outputs["stacked"],
+        "has_xlsx": outputs["xlsx"],
+        "has_html": outputs["html"],
         "has_toc": bool(j.get("toc")),
         # stable URLs (client will cache-bust with ?v=)
         "organizer_url": f"/job/{jid}/organizer",
@@ -629,7 +637,7 @@ def job_page(jid: str):
         return HTMLResponse("<h3>Job not found</h3>", status_code=404)
 
     status = j.get("status", "")
-    pct, stage_text = store.compute_progress_percent(jid)
+    pct, stage_text = store.compute_progress_percent(jid, j)
     pct = max(0, min(100, pct))
 
     status_line = stage_text
@@ -869,20 +877,44 @@ body{
         setTimeout(function(){
           window.location.replace(nextUrl + "?" + bust);
         }, 500);
-        clearInterval(timer);
+        stopPolling();
       } else if(s.status === "error"){
         showErr(s.error);
-        clearInterval(timer);
+        stopPolling();
       }
     }catch(e){
       // Ignore transient network errors; next poll will recover.
     }
   }
 
+  var timer = null;
+  var finished = false;
+
+  function startPolling(){
+    if (timer || finished) return;
+    tick();
+    timer = setInterval(tick, 1000);
+  }
+
+  function pausePolling(){
+    if (!timer) return;
+    clearInterval(timer);
+    timer = null;
+  }
+
+  function stopPolling(){
+    finished = true;
+    pausePolling();
+  }
+
   updateVanBounds();
   window.addEventListener("resize", updateVanBounds);
-  tick();
-  var timer = setInterval(tick, 1000);
+  // Don't poll from background tabs; catch up as soon as the page is visible again.
+  document.addEventListener("visibilitychange", function(){
+    if (document.hidden) pausePolling();
+    else startPolling();
+  });
+  startPolling();
 })();
 </script>
 </body>
@@ -2060,155 +2092,29 @@ iframe{{border:0; display:block; width:100%; height:100%}}
     </div>
   </div>
   <div class="wrap">
-    <iframe id="orgFrame" src="/job/{jid}/organizer_raw?v=1" scrolling="no"></iframe>
+    <iframe id="orgFrame" data-jid="{jid}" src="/job/{jid}/organizer_raw?v=1" scrolling="no"></iframe>
   </div>
 
-<script>
-(function () {{
-  var frame = document.getElementById("orgFrame");
-  var params = new URLSearchParams(window.location.search);
-  var routeParam = params.get("route");
-  // cache-bust iframe so it always pulls the newest organizer without manual refresh
-  var src = "/job/{jid}/organizer_raw?v=" + Date.now();
-  if(routeParam){{
-    src += "&route=" + encodeURIComponent(routeParam);
-  }}
-  frame.src = src;
-}})();
-(function(){{
-  var root = document.documentElement;
-  setTimeout(function(){{
-    root.classList.add("bannerMin");
-  }}, 3000);
-
-  var hudTitle = document.getElementById("hudTitle");
-  var pillBags = document.getElementById("hudPillBags");
-  var pillOverflow = document.getElementById("hudPillOverflow");
-  var hudRight = document.querySelector(".hudRight");
-  var hudWrap = document.getElementById("bannerHUD");
-  var iframe = document.getElementById("orgFrame");
-  var lastBags = null;
-  var lastBagsLoaded = 0;
-  var lastOverflow = null;
-  var lastOverflowLoaded = 0;
-  var lastFooterWidth = 0;
-  var activeHudTab = "bags_overflow";
-
-  document.querySelectorAll(".hudTab").forEach(function(btn){{
-    btn.addEventListener("click", function(){{
-      document.querySelectorAll(".hudTab").forEach(function(b){{ b.classList.remove("active"); }});
-      btn.classList.add("active");
-      activeHudTab = btn.dataset.tab || "bags_overflow";
-      updateHudPillVisibility();
-      if(iframe && iframe.contentWindow){{
-        iframe.contentWindow.postMessage({{ type:"setTab", tab: btn.dataset.tab }}, "*");
-      }}
-    }});
-  }});
-  var defaultTab = document.querySelector('.hudTab[data-tab="bags_overflow"]');
-  if(defaultTab) defaultTab.classList.add("active");
-  updateHudPillVisibility();
-
-  function shouldShowBags(){{
-    return activeHudTab === "bags" || activeHudTab === "bags_overflow";
-  }}
-
-  function shouldShowOverflow(){{
-    return activeHudTab === "overflow" || activeHudTab === "bags_overflow";
-  }}
-
-  function applyHudStacking(){{
-    var selectedCount = parseInt(lastBagsLoaded || 0, 10);
-    var footerWidth = parseInt(lastFooterWidth || 0, 10);
-    var shouldStack = selectedCount > 0;
-    var allowStack = activeHudTab === "bags" || activeHudTab === "bags_overflow";
-    if(hudRight) hudRight.classList.toggle("stacked", shouldStack && allowStack);
-    if(hudWrap){{
-      if(shouldStack && allowStack && footerWidth > 0){{
-        hudWrap.style.setProperty("--hud-pill-target-width", footerWidth + "px");
-      }}else{{
-        hudWrap.style.removeProperty("--hud-pill-target-width");
-      }}
-    }}
-  }}
-
-  function updateHudPillVisibility(){{
-    if(pillBags) pillBags.style.display = shouldShowBags() ? "inline-flex" : "none";
-    if(pillOverflow) pillOverflow.style.display = shouldShowOverflow() ? "inline-flex" : "none";
-    applyHudStacking();
-  }}
-
-  window.addEventListener("message", function(ev){{
-    var d = ev.data || {{}};
-    if(d.type !== "routeMeta") return;
-
-    if(hudTitle) hudTitle.textContent = d.title || "—";
-
-    function formatProgress(total, selected, label){{
-      if(total === undefined || total === null) return "—";
-      var totalNum = parseInt(total, 10);
-      if(Number.isNaN(totalNum)) return "—";
-      var selectedNum = parseInt(selected, 10);
-      if(Number.isNaN(selectedNum)) selectedNum = 0;
-      var suffix = label ? " " + label : "";
-      if(selectedNum <= 0){{
-        return totalNum + suffix;
-      }}
-      var remaining = Math.max(totalNum - selectedNum, 0);
-      return selectedNum + "/" + totalNum + suffix + " (" + remaining + " left)";
-    }}
-
-    function setPillProgress(pill, total, selected){{
-      if(!pill) return;
-      var totalNum = parseInt(total, 10);
-      if(Number.isNaN(totalNum) || totalNum <= 0){{
-        pill.style.setProperty("--pill-progress", "0%");
-        return;
-      }}
-      var selectedNum = parseInt(selected, 10);
-      if(Number.isNaN(selectedNum)) selectedNum = 0;
-      var pct = Math.max(0, Math.min(selectedNum / totalNum, 1));
-      pill.style.setProperty("--pill-progress", (pct * 100).toFixed(1) + "%");
-    }}
-
-    if(d.bags !== undefined && d.bags !== null) lastBags = d.bags;
-    if(d.bags_loaded !== undefined && d.bags_loaded !== null) lastBagsLoaded = d.bags_loaded;
-    if(d.overflow !== undefined && d.overflow !== null) lastOverflow = d.overflow;
-    if(d.overflow_loaded !== undefined && d.overflow_loaded !== null) lastOverflowLoaded = d.overflow_loaded;
-    if(d.footer_pill_width !== undefined && d.footer_pill_width !== null) lastFooterWidth = d.footer_pill_width;
-
-    var bags = lastBags;
-    var bagsLoaded = lastBagsLoaded;
-    if(pillBags) pillBags.textContent = formatProgress(bags, bagsLoaded, "bags");
-    setPillProgress(pillBags, bags, bagsLoaded);
-    var overflow = lastOverflow;
-    var overflowLoaded = lastOverflowLoaded;
-    if(pillOverflow) pillOverflow.textContent = formatProgress(overflow, overflowLoaded, "overflow");
-    setPillProgress(pillOverflow, overflow, overflowLoaded);
-    applyHudStacking();
-
-  }});
-}})();
-</script>
+<script src="/static/js/organizer_wrapper.v1.js" defer></script>
 </body>
 </html>
 """)
 
 
-@app.get("/job/{jid}/toc-data")
+@app.get("/job/{jid}/toc-data", response_class=ORJSONResponse)
 def toc_data(jid: str):
     j = store.get(jid)
     if j.get("status") == "missing":
-        return JSONResponse({"status": "missing"}, status_code=404)
+        return ORJSONResponse({"status": "missing"}, status_code=404)
 
     toc = j.get("toc") or {}
     routes = toc.get("routes") or []
     date_label = toc.get("date_label") or ""
 
     if not routes:
-        return JSONResponse({"status": "not_ready"}, status_code=404)
+        return ORJSONResponse({"status": "not_ready"}, status_code=404)
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "ok",
             "date_label": date_label,
@@ -2220,14 +2126,14 @@ def toc_data(jid: str):
     )
 
 
-@app.get("/job/{jid}/summary-data")
+@app.get("/job/{jid}/summary-data", response_class=ORJSONResponse)
 def summary_data(jid: str):
     j = store.get(jid)
     if j.get("status") == "missing":
-        return JSONResponse({"status": "missing"}, status_code=404)
+        return ORJSONResponse({"status": "missing"}, status_code=404)
 
     summary = j.get("summary") or {}
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "status": "ok",
             "mismatches": summary.get("mismatches") or [],
@@ -4112,10 +4018,9 @@ img, svg, iframe{{
   }}
 
   function populateWaves(){{
-    waveSelect.innerHTML = "";
     var labels = Object.keys(groupedRoutes);
     if(!labels.length){{
-      waveSelect.innerHTML = "<option value=''>No waves found</option>";
+      waveSelect.replaceChildren(new Option("No waves found", ""));
       waveSelect.disabled = true;
       if(waveControl) {{
         waveControl.disabled = true;
@@ -4128,8 +4033,7 @@ img, svg, iframe{{
     var placeholder = new Option("Select Wave", "");
     placeholder.disabled = true;
     placeholder.selected = true;
-    waveSelect.appendChild(placeholder);
-    labels.forEach(function(label, index){{
+    var opts = [placeholder].concat(labels.map(function(label, index){{
       var opt = new Option(ordinalize(index + 1) + " " + label, label);
       var key = label.replace("Wave: ", "");
       var color = waveColors[key];
@@ -4137,20 +4041,20 @@ img, svg, iframe{{
         opt.style.color = color;
         opt.dataset.color = color;
       }}
-      waveSelect.appendChild(opt);
-    }});
+      return opt;
+    }}));
+    waveSelect.replaceChildren.apply(waveSelect, opts);
     waveSelect.disabled = false;
     if(waveControl) waveControl.disabled = false;
     syncWaveControl();
   }}
 
   function populateRoutes(label){{
-    routeSelect.innerHTML = "";
     openRoute.disabled = true;
     if(!label || !groupedRoutes[label]){{
       var placeholder = new Option("Select Route", "");
       placeholder.disabled = true;
-      routeSelect.appendChild(placeholder);
+      routeSelect.replaceChildren(placeholder);
       routeSelect.disabled = true;
       setRouteGroupVisibility(false);
       if(routeControl) {{
@@ -4169,14 +4073,14 @@ img, svg, iframe{{
     if(waveColor) placeholder.style.color = waveColor;
     placeholder.disabled = true;
     placeholder.selected = true;
-    routeSelect.appendChild(placeholder);
-    groupedRoutes[label].forEach(function(route){{
+    var opts = [placeholder].concat(groupedRoutes[label].map(function(route){{
       var opt = new Option(route.title, route.key);
       if(waveColor){{
         opt.style.color = waveColor;
       }}
-      routeSelect.appendChild(opt);
-    }});
+      return opt;
+    }}));
+    routeSelect.replaceChildren.apply(routeSelect, opts);
     routeSelect.value = "";
     if(routeControl) routeControl.style.color = waveColor || "";
     syncRouteControl();
@@ -4232,11 +4136,18 @@ img, svg, iframe{{
     }}
   }});
 
+  var waveStyleFrame = 0;
+
   waveSelect.addEventListener("change", function(){{
+    // Options must exist right away for the next pick; the color writes can share one frame.
     populateRoutes(waveSelect.value);
-    applyWaveColor();
-    syncWaveControl();
-    syncRouteControl();
+    if(waveStyleFrame) cancelAnimationFrame(waveStyleFrame);
+    waveStyleFrame = requestAnimationFrame(function(){{
+      waveStyleFrame = 0;
+      applyWaveColor();
+      syncWaveControl();
+      syncRouteControl();
+    }});
   }});
 
   routeSelect.addEventListener("change", function(){{
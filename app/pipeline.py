@@ -1,19 +1,26 @@
 from __future__ import annotations
 
-import json
+import atexit
+import functools
 import math
+import multiprocessing
 import os
 import re
 import threading
 import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 
+import fitz  # PyMuPDF
 import numpy as np
+import orjson
 import pdfplumber
-import pandas as pd
+from pdfminer.high_level import extract_text as pdfminer_extract_text
+import xlsxwriter
+import xxhash
 from PIL import Image
 
 # we vendor these scripts into /tools
@@ -26,11 +33,20 @@ if tools_dir_str not in sys.path:
 from route_stacker import (
     parse_route_page,
     assign_overflows,
-    df_from,
+    rows_from,
     build_stacked_pdf_with_summary_grouped,
 )
+from build_van_organizer_v21_hide_combined_ORIGPDF import (
+    PARALLEL_PARSE_MIN_PAGES,
+    PARSE_PAGES_PER_TASK,
+    build_organizer,
+    parse_workers,
+)
 
 DATE_RE = re.compile(r"\b(?:MON|TUE|WED|THU|FRI|SAT|SUN),\s+[A-Z]{3}\s+\d{1,2},\s+\d{4}\b")
+_ROUTE_PAGE_PROBES = ("sort", "zone", "pkg")
+_WEEKDAY_PREFIXES = ("MON,", "TUE,", "WED,", "THU,", "FRI,", "SAT,", "SUN,")
+_TIME_RE = re.compile(r"(\d{1,2})\s*[:.]\s*(\d{2})\s*([AaPp])?\s*([Mm])?")
 
 STAGE_TEXT = {
     "parse_pdf": "Processing File…",
@@ -54,26 +70,68 @@ STAGE_PROGRESS_CAP = 0.98
 EMA_ALPHA = 0.35
 EMA_EXPECTED_MIN_SECONDS = 0.5
 EMA_EXPECTED_MAX_SECONDS = 600.0
-
-
-def auto_detect_date_label(pdf_path: str) -> str:
+EMA_FLUSH_SECONDS = 2.0
+JOB_FLUSH_SECONDS = 0.25
+OUTPUTS_RECHECK_SECONDS = 5.0
+JOB_OUTPUTS = {
+    "xlsx": "Bags_with_Overflow.xlsx",
+    "html": "van_organizer.html",
+    "stacked": "STACKED.pdf",
+}
+DATE_SCAN_PAGES = 4
+SEQUENTIAL_PARSE_CHUNK_PAGES = 25
+PAGE_REPORT_EVERY = 10
+PAGE_REPORT_SECONDS = 0.2
+BAND_SCAN_WINDOW = 32
+# Band detection runs at ~0.03-0.06 s per megapixel, against ~0.75 s to spawn a worker
+# that re-imports this module, so only a pile of large images is worth a pool.
+PARALLEL_BANDS_MIN_PIXELS = 40_000_000
+PAGE_TEXT_CACHE_DIR = Path(os.environ.get("VANORG_CACHE_DIR") or "/tmp/vanorg_cache")
+PAGE_TEXT_CACHE_VERSION = 1
+# The cache holds customer route-sheet text, so entries expire after a day and the
+# directory is trimmed (least recently used first) to stay under the byte budget.
+PAGE_TEXT_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+PAGE_TEXT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _date_label_from_text(text: str) -> Optional[str]:
+    upper = (text or "").upper()
+    # Substring checks are far cheaper than a failed DATE_RE scan over a whole page.
+    if not any(prefix in upper for prefix in _WEEKDAY_PREFIXES):
+        return None
+    m = DATE_RE.search(upper)
+    return m.group(0) if m else None
+
+
+def auto_detect_date_label(pdf_path: str, page_texts: Optional[list[str]] = None) -> str:
+    """
+    Standalone fallback; process_job gets the label from the page-parse pass instead.
+    page_texts, if the caller already has them, replace any extraction here.
+    """
+    if page_texts is not None:
+        for text in page_texts[:DATE_SCAN_PAGES]:
+            label = _date_label_from_text(text)
+            if label:
+                return label
+        return "DATE UNKNOWN"
+    # The label is almost always on page 1, and pdfminer's plain text pass skips
+    # pdfplumber's word/char layout work. Only scan the next pages if it's missing.
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for p in pdf.pages[:4]:
-                t = (p.extract_text() or "").upper()
-                m = DATE_RE.search(t)
-                if m:
-                    return m.group(0)
+        for page_numbers in ([0], range(1, DATE_SCAN_PAGES)):
+            label = _date_label_from_text(pdfminer_extract_text(pdf_path, page_numbers=page_numbers) or "")
+            if label:
+                return label
     except Exception:
         pass
     return "DATE UNKNOWN"
 
 
 def _clamp_pct(x: int) -> int:
-    try:
-        x = int(x)
-    except Exception:
-        x = 0
+    if type(x) is not int:  # bools go through int() too
+        try:
+            x = int(x)
+        except Exception:
+            x = 0
     return max(0, min(100, x))
 
 
@@ -81,13 +139,13 @@ def _monotonic_seconds() -> float:
     return time.monotonic()
 
 
-def _atomic_write_text(path: Path, text: str) -> None:
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_name(path.name + f".tmp-{uuid.uuid4().hex}")
 
     try:
-        with open(tmp, "w", encoding="utf-8") as f:
-            f.write(text)
+        with open(tmp, "wb") as f:
+            f.write(data)
             f.flush()
             os.fsync(f.fileno())
         os.replace(tmp, path)  # atomic on POSIX
@@ -101,14 +159,12 @@ def _atomic_write_text(path: Path, text: str) -> None:
 
 
 def _atomic_write_json(path: Path, payload: Any) -> None:
-    _atomic_write_text(path, json.dumps(payload, ensure_ascii=False))
+    _atomic_write_bytes(path, orjson.dumps(payload))
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_time_label(label: str, require_ampm: bool = False) -> str:
-    match = re.search(
-        r"(\d{1,2})\s*[:.]\s*(\d{2})\s*([AaPp])?\s*([Mm])?",
-        label or "",
-    )
+    match = _TIME_RE.search(label or "")
     if not match:
         return ""
     hh = int(match.group(1))
@@ -127,10 +183,7 @@ def _normalize_time_label(label: str, require_ampm: bool = False) -> str:
     return f"{hh:02d}:{mm:02d}"
 
 
-def _time_sort_key(label: str) -> int:
-    key = _normalize_time_label(label)
-    if not key:
-        return 0
+def _minutes_from_key(key: str) -> int:
     hh, mm = key.split(":")
     return int(hh) * 60 + int(mm)
 
@@ -161,54 +214,86 @@ def _margin_samples(arr: np.ndarray) -> np.ndarray:
     return np.concatenate([left, right], axis=1)
 
 
-def _median_color(block: np.ndarray) -> np.ndarray:
-    return np.median(block.reshape(-1, 3), axis=0)
+def _midpoint(samples: np.ndarray, axis: int) -> np.ndarray:
+    # Upper median via a single np.partition selection. Unlike a mean, it
+    # ignores the few dark text/anti-aliasing pixels that land in a margin.
+    mid = samples.shape[axis] // 2
+    return np.take(np.partition(samples, mid, axis=axis), mid, axis=axis).astype(np.float64)
+
+
+def _median_rows(samples: np.ndarray) -> np.ndarray:
+    # Same result as np.median(samples, axis=0) for a float (N, 3) array, from one
+    # partition call and without np.median's per-call wrapper overhead, which
+    # dominates on the short row runs the merge pass feeds it.
+    n = samples.shape[0]
+    k = n // 2
+    if n % 2:
+        return np.partition(samples, k, axis=0)[k]
+    part = np.partition(samples, (k - 1, k), axis=0)
+    return (part[k - 1] + part[k]) / 2
+
+
+def _representative_color(block: np.ndarray) -> np.ndarray:
+    return _midpoint(block.reshape(-1, 3), axis=0)
 
 
 def _detect_color_bands(image: Image.Image) -> list[tuple[int, int, np.ndarray]]:
-    original = image.convert("RGB")
+    # convert() always copies, and extract_wave_color_map already hands us RGB.
+    original = image if image.mode == "RGB" else image.convert("RGB")
     width, height = original.size
     if width < 2 or height < 2:
         return []
 
-    target_width = min(300, width)
-    work_img = original
-    if width != target_width:
-        work_img = original.resize((target_width, height))
-    work_arr = np.array(work_img)
-    row_samples = _margin_samples(work_arr)
-    row_colors = np.median(row_samples, axis=1)
+    # Band colors live in the left/right margins, so sample those strips straight
+    # from the full-size image instead of resampling the whole page first.
+    margin_samples = _margin_samples(np.asarray(original))
+    row_colors = _midpoint(margin_samples, axis=1)
 
     threshold = 20.0
-    segments: list[tuple[int, int]] = []
-    start = 0
-    current = row_colors[0]
-    for i in range(1, len(row_colors)):
-        if np.linalg.norm(row_colors[i] - current) > threshold:
-            segments.append((start, i - 1))
-            start = i
-            current = row_colors[i]
-    segments.append((start, len(row_colors) - 1))
-
+    # A segment ends at the first row that drifts more than `threshold` away from
+    # the segment's first row. Comparing against the start row (not the row above)
+    # keeps soft, anti-aliased band edges from slipping through, so each segment
+    # is found with one vectorized scan instead of one norm() call per row. Each
+    # segment is folded into the previous run as soon as it's found when their
+    # colors are close, so there's no separate merge pass over a segment list.
+    # The scan looks at a window that doubles until it finds the jump, so short
+    # noise segments don't each pay for a pass over the rest of the image.
     merged: list[tuple[int, int]] = []
     prev_color = None
-    for seg_start, seg_end in segments:
-        seg_color = np.median(row_colors[seg_start : seg_end + 1], axis=0)
-        if not merged:
-            merged.append((seg_start, seg_end))
-            prev_color = seg_color
-            continue
+    n_rows = len(row_colors)
+    threshold_sq = threshold * threshold
+    start = 0
+    while start < n_rows:
+        end = n_rows - 1
+        lo = start + 1
+        window = BAND_SCAN_WINDOW
+        while lo < n_rows:
+            hi = min(lo + window, n_rows)
+            deltas = row_colors[lo:hi] - row_colors[start]
+            jumps = np.flatnonzero(np.einsum("ij,ij->i", deltas, deltas) > threshold_sq)
+            if jumps.size:
+                end = lo + int(jumps[0]) - 1
+                break
+            lo = hi
+            window *= 2
+
+        # Noise on cluttered pages shows up as one-row segments; their median is
+        # just the row, and they still have to take part in merging, so only the
+        # reduction (not the segment) is skipped.
+        if end == start:
+            seg_color = row_colors[start]
+        else:
+            seg_color = _median_rows(row_colors[start : end + 1])
         if prev_color is not None and np.linalg.norm(seg_color - prev_color) < threshold:
-            merged[-1] = (merged[-1][0], seg_end)
-            prev_color = np.median(row_colors[merged[-1][0] : seg_end + 1], axis=0)
+            merged[-1] = (merged[-1][0], end)
+            prev_color = _median_rows(row_colors[merged[-1][0] : end + 1])
         else:
-            merged.append((seg_start, seg_end))
+            merged.append((start, end))
             prev_color = seg_color
+        start = end + 1
 
     min_height = max(6, int(len(row_colors) * 0.01))
     bands: list[tuple[int, int, np.ndarray]] = []
-    orig_arr = np.array(original)
-    margin_samples = _margin_samples(orig_arr)
     for seg_start, seg_end in merged:
         if (seg_end - seg_start + 1) < min_height:
             continue
@@ -219,11 +304,57 @@ def _detect_color_bands(image: Image.Image) -> list[tuple[int, int, np.ndarray]]
         band_patch = margin_samples[band_y0:band_y1, :, :]
         if band_patch.size == 0:
             continue
-        bands.append((seg_start, seg_end, _median_color(band_patch)))
+        bands.append((seg_start, seg_end, _representative_color(band_patch)))
     return bands
 
 
-def extract_wave_color_map(image_paths: list[Path], toc_entries: list[dict]) -> dict[str, str]:
+def _detect_image_bands(image_path: Path) -> list[WaveBand]:
+    """Bands for one wave image, top to bottom. Top-level so it can run in a worker process."""
+    try:
+        with Image.open(image_path) as img:
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            bands = sorted(_detect_color_bands(img), key=lambda band: band[0])
+    except Exception as exc:
+        print(f"[wave-colors] Failed to process {image_path.name}: {exc}")
+        return []
+    return [WaveBand(y_start=y_start, y_end=y_end, rgb=rgb) for y_start, y_end, rgb in bands]
+
+
+def _image_pixels(image_path: Path) -> int:
+    # Image.open only reads the header, so this is cheap next to decoding.
+    try:
+        with Image.open(image_path) as img:
+            width, height = img.size
+    except Exception:
+        return 0
+    return width * height
+
+
+def detect_wave_bands(image_paths: list[Path]) -> list[WaveBand]:
+    """
+    Detect color bands across all wave images, top to bottom, in file-name order.
+    Doesn't need the TOC, so process_job runs it alongside the stacker.
+    """
+    ordered = sorted(image_paths, key=lambda p: p.name)
+    workers = min(parse_workers(), len(ordered))
+    if workers <= 1 or sum(map(_image_pixels, ordered)) < PARALLEL_BANDS_MIN_PIXELS:
+        per_image = [_detect_image_bands(path) for path in ordered]
+    else:
+        # Decode + segmentation is CPU-bound per image; see generate_bags_xlsx_from_routesheets
+        # for why this uses spawned processes.
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            per_image = list(pool.map(_detect_image_bands, ordered))
+
+    return [band for bands in per_image for band in bands]
+
+
+def extract_wave_color_map(
+    image_paths: list[Path],
+    toc_entries: list[dict],
+    detected_bands: Optional[list[WaveBand]] = None,
+) -> dict[str, str]:
     if not image_paths or not toc_entries:
         return {}
 
@@ -235,7 +366,7 @@ def extract_wave_color_map(image_paths: list[Path], toc_entries: list[dict]) ->
         if not key or key in seen:
             continue
         seen.add(key)
-        time_items.append((key, _time_sort_key(raw)))
+        time_items.append((key, _minutes_from_key(key)))
 
     time_items.sort(key=lambda item: item[1])
     time_labels = [key for key, _ in time_items]
@@ -243,23 +374,8 @@ def extract_wave_color_map(image_paths: list[Path], toc_entries: list[dict]) ->
     if not time_labels:
         return {}
 
-    detected_bands: list[WaveBand] = []
-
-    for image_path in sorted(image_paths, key=lambda p: p.name):
-        try:
-            with Image.open(image_path) as img:
-                img = img.convert("RGB")
-                bands = sorted(_detect_color_bands(img), key=lambda band: band[0])
-                for y_start, y_end, rgb in bands:
-                    detected_bands.append(
-                        WaveBand(
-                            y_start=y_start,
-                            y_end=y_end,
-                            rgb=rgb,
-                        )
-                    )
-        except Exception as exc:
-            print(f"[wave-colors] Failed to process {image_path.name}: {exc}")
+    if detected_bands is None:
+        detected_bands = detect_wave_bands(image_paths)
 
     if not detected_bands:
         return {}
@@ -284,6 +400,136 @@ def extract_wave_color_map(image_paths: list[Path], toc_entries: list[dict]) ->
     return {time_key: _rgb_to_hex(mapping[time_key].rgb) for time_key in time_labels[:count]}
 
 
+def _route_sheet_from_text(text: str) -> Optional[tuple[str, list[list]]]:
+    # parse_route_page bails out unless a line matches its "sort zone [bag] pkgs"
+    # header, so pages missing any of those words (covers, blanks, summaries)
+    # can be rejected with substring checks before its per-line regex work.
+    folded = text.casefold()
+    if not all(probe in folded for probe in _ROUTE_PAGE_PROBES):
+        return None
+    parsed = parse_route_page(text)
+    if not parsed:
+        return None
+
+    rs, cx, *_rest = parsed
+    if not rs or not cx:
+        return None
+
+    bags = parsed[4]
+    overs = parsed[5]
+
+    texts, totals, _overflow_fallback_used, _fallback_events = assign_overflows(bags, overs)
+    rows = rows_from(bags, texts, totals)
+
+    sheet_name = f"{rs}_{cx}"  # matches builder SHEET_RE
+    return sheet_name, rows
+
+
+def _parse_page_text(
+    page_index: int,
+    text: str,
+    routes: list[tuple[int, str, list[list]]],
+    date_hits: list[tuple[int, str]],
+) -> None:
+    if page_index < DATE_SCAN_PAGES:
+        label = _date_label_from_text(text)
+        if label:
+            date_hits.append((page_index, label))
+    route = _route_sheet_from_text(text)
+    if route is not None:
+        routes.append((page_index, *route))
+
+
+def _parse_route_pages(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> tuple[list[tuple[int, str, list[list]]], list[tuple[int, str]], list[tuple[int, str]]]:
+    """
+    Parse pages [start, stop) into (page_index, sheet_name, rows) tuples, plus
+    (page_index, date_label) hits from the first DATE_SCAN_PAGES pages and the
+    extracted (page_index, text) pairs for the page-text cache.
+    Opens its own pdfplumber handle so it can run in a worker process.
+    """
+    routes = []
+    date_hits = []
+    texts = []
+    page_numbers = list(range(start + 1, stop + 1))
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            page_index = page.page_number - 1
+            if on_page:
+                on_page(page_index)
+            text = page.extract_text() or ""
+            # Drop the page's char/object and textmap caches now rather than holding
+            # every parsed page until the document closes.
+            page.close()
+            texts.append((page_index, text))
+            _parse_page_text(page_index, text, routes, date_hits)
+    return routes, date_hits, texts
+
+
+def _pdf_digest(pdf_path: str) -> str:
+    # Only a cache key, not a security boundary: xxh3 hashes at memory speed.
+    h = xxhash.xxh3_128()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _page_text_cache_path(digest: str) -> Path:
+    return PAGE_TEXT_CACHE_DIR / f"{digest}.pages.v{PAGE_TEXT_CACHE_VERSION}.json"
+
+
+def _load_page_text_cache(digest: str) -> Optional[list[str]]:
+    path = _page_text_cache_path(digest)
+    if not path.exists():
+        return None
+    try:
+        texts = orjson.loads(path.read_bytes())
+    except Exception as exc:
+        print(f"[page-text-cache] Failed to read {path.name}: {exc}")
+        return None
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return None
+    try:
+        os.utime(path)  # mark as recently used for _prune_page_text_cache
+    except OSError:
+        pass
+    return texts
+
+
+def _prune_page_text_cache() -> None:
+    """Drop expired entries, then the least recently used ones past the byte budget."""
+    now = time.time()
+    entries = []
+    for path in PAGE_TEXT_CACHE_DIR.glob("*.pages.v*.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if now - st.st_mtime > PAGE_TEXT_CACHE_MAX_AGE_SECONDS:
+            path.unlink(missing_ok=True)
+        else:
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _mtime, size, _path in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= PAGE_TEXT_CACHE_MAX_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _save_page_text_cache(digest: str, texts: list[str]) -> None:
+    try:
+        _atomic_write_json(_page_text_cache_path(digest), texts)
+        _prune_page_text_cache()
+    except Exception as exc:
+        print(f"[page-text-cache] Failed to write cache: {exc}")
+
+
 def generate_bags_xlsx_from_routesheets(
     pdf_path: str,
     out_xlsx: str,
@@ -293,13 +539,15 @@ def generate_bags_xlsx_from_routesheets(
     Creates multi-sheet xlsx where each sheet name matches builder expectation:
       <RS>_<CX>  e.g. H.7_CX92
     Each sheet rows: Bag | Overflow Zone(s) | Overflow Pkgs (total)
+
+    Also returns the header date label ("date_label", None if not found) so
+    callers don't have to reopen the PDF for auto_detect_date_label, and every
+    page's extracted text ("page_texts") for the later stages to reuse.
     """
-    out = {"routes": 0, "errors": []}
+    out = {"routes": 0, "errors": [], "date_label": None, "page_texts": []}
     pdf_path = str(pdf_path)
     out_xlsx = str(out_xlsx)
 
-    wb_routes = []
-
     def report(stage: str, msg: str, extra: Optional[dict] = None):
         if not progress_cb:
             return
@@ -313,47 +561,125 @@ def generate_bags_xlsx_from_routesheets(
 
     report("parse_pdf", STAGE_TEXT["parse_pdf"])
 
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages) or 1
+    # The same route PDF often gets uploaded more than once (re-runs, fixes to the
+    # wave images); text extraction dominates parsing, so reuse it by content hash.
+    digest = _pdf_digest(pdf_path)
+    cached_texts = _load_page_text_cache(digest)
+    if cached_texts is not None:
+        total_pages = len(cached_texts)
+    else:
+        # PyMuPDF reads the page count from the xref alone; opening the file with
+        # pdfplumber just to count pages would load the whole page tree again.
+        with fitz.open(pdf_path) as doc:
+            total_pages = doc.page_count
+
+    last_reported_page = 0
+    last_reported_at = 0.0
+
+    def report_pages(done: int) -> None:
+        nonlocal last_reported_page, last_reported_at
+        # Page ticks are cosmetic; emit at most every PAGE_REPORT_EVERY pages or
+        # PAGE_REPORT_SECONDS, plus the final page.
+        now = time.monotonic()
+        if (
+            done < total_pages
+            and done - last_reported_page < PAGE_REPORT_EVERY
+            and now - last_reported_at < PAGE_REPORT_SECONDS
+        ):
+            return
+        last_reported_page = done
+        last_reported_at = now
+        report(
+            "parse_pdf",
+            f"{STAGE_TEXT['parse_pdf']} ({done}/{max(total_pages, 1)})",
+            {"page": done, "pages": max(total_pages, 1)},
+        )
 
-        for i, page in enumerate(pdf.pages, start=1):
-            # progress update
-            report(
-                "parse_pdf",
-                f"{STAGE_TEXT['parse_pdf']} ({i}/{total_pages})",
-                {"page": i, "pages": total_pages},
+    chunks = [
+        (start, min(start + PARSE_PAGES_PER_TASK, total_pages))
+        for start in range(0, total_pages, PARSE_PAGES_PER_TASK)
+    ]
+    workers = min(parse_workers(), len(chunks))
+
+    parsed_pages: list[tuple[int, str, list[list]]] = []
+    date_hits: list[tuple[int, str]] = []
+    page_texts: list[tuple[int, str]] = []
+    if cached_texts is not None:
+        for page_index, text in enumerate(cached_texts):
+            _parse_page_text(page_index, text, parsed_pages, date_hits)
+        report_pages(total_pages)
+    elif workers <= 1 or total_pages < PARALLEL_PARSE_MIN_PAGES:
+        # Reopen every SEQUENTIAL_PARSE_CHUNK_PAGES pages so one pdfplumber handle
+        # never holds the whole document's page objects at once.
+        for start in range(0, total_pages, SEQUENTIAL_PARSE_CHUNK_PAGES):
+            chunk_routes, chunk_dates, chunk_texts = _parse_route_pages(
+                pdf_path,
+                start,
+                min(start + SEQUENTIAL_PARSE_CHUNK_PAGES, total_pages),
+                on_page=lambda page_index: report_pages(page_index + 1),
             )
-
-            text = page.extract_text() or ""
-            parsed = parse_route_page(text)
-            if not parsed:
-                continue
-
-            rs, cx, *_rest = parsed
-            if not rs or not cx:
-                continue
-
-            bags = parsed[4]
-            overs = parsed[5]
-
-            texts, totals, _overflow_fallback_used, _fallback_events = assign_overflows(bags, overs)
-            df = df_from(bags, texts, totals)
-
-            sheet_name = f"{rs}_{cx}"  # matches builder SHEET_RE
-            wb_routes.append((sheet_name, df))
-            out["routes"] += 1
+            parsed_pages.extend(chunk_routes)
+            date_hits.extend(chunk_dates)
+            page_texts.extend(chunk_texts)
+    else:
+        # pdfplumber is not thread-safe and text extraction is CPU-bound, so fan
+        # page chunks out to processes. "spawn" avoids forking this threaded server.
+        pages_done = 0
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {
+                pool.submit(_parse_route_pages, pdf_path, start, stop): stop - start
+                for start, stop in chunks
+            }
+            for fut in as_completed(futures):
+                chunk_routes, chunk_dates, chunk_texts = fut.result()
+                parsed_pages.extend(chunk_routes)
+                date_hits.extend(chunk_dates)
+                page_texts.extend(chunk_texts)
+                pages_done += futures[fut]
+                report_pages(pages_done)
+        parsed_pages.sort(key=lambda item: item[0])
+
+    if cached_texts is None:
+        page_texts.sort(key=lambda item: item[0])
+        cached_texts = [text for _page_index, text in page_texts]
+        _save_page_text_cache(digest, cached_texts)
+    out["page_texts"] = cached_texts
+
+    if date_hits:
+        out["date_label"] = min(date_hits)[1]
+
+    out["routes"] = len(parsed_pages)
 
     if out["routes"] == 0:
         raise RuntimeError("No routes were parsed from the uploaded PDF.")
 
     report("excel", f"{STAGE_TEXT['excel']} ({out['routes']} routes)")
 
+    # Rows are streamed below, so a repeated sheet name can't be overlaid after
+    # the fact; fold repeats here the way an overlay would land.
+    sheets: dict[str, list[list]] = {}
+    for _page_index, sheet_name, rows in parsed_pages:
+        safe = sheet_name[:31]  # Excel sheet name max length
+        prev = sheets.get(safe)
+        if prev is not None and len(prev) > len(rows):
+            rows = rows + prev[len(rows):]
+        sheets[safe] = rows
+    del parsed_pages
+
+    # constant_memory flushes each row once the next one starts, so rows go out
+    # in order, straight from the parsed lists with no DataFrame in between.
     Path(out_xlsx).parent.mkdir(parents=True, exist_ok=True)
-    with pd.ExcelWriter(out_xlsx, engine="openpyxl") as writer:
-        for sheet_name, df in wb_routes:
-            safe = sheet_name[:31]  # Excel sheet name max length
-            df.to_excel(writer, sheet_name=safe, index=False, header=False)
-
+    workbook = xlsxwriter.Workbook(out_xlsx, {"constant_memory": True})
+    try:
+        # Drop each sheet's rows once written so only the one being streamed
+        # stays referenced.
+        for safe in list(sheets):
+            ws = workbook.add_worksheet(safe)
+            for r, row in enumerate(sheets.pop(safe)):
+                ws.write_row(r, 0, row)
+    finally:
+        workbook.close()
 
     report("excel", "Generating Data… Done.")
     return out
@@ -364,12 +690,11 @@ def run_builder_html(
     xlsx_path: str,
     out_html: str,
     progress_cb: Optional[Callable[..., None]] = None,
+    page_texts: Optional[list[str]] = None,
 ) -> None:
     """
-    Calls your v21 builder script.
+    Calls your v21 builder script in-process.
     """
-    import subprocess
-
     def report(msg: str, extra: Optional[dict] = None):
         if not progress_cb:
             return
@@ -381,18 +706,15 @@ def run_builder_html(
             payload.update(extra)
         progress_cb(**payload)
 
-    builder = Path(__file__).resolve().parents[1] / "tools" / "build_van_organizer_v21_hide_combined_ORIGPDF.py"
-    cmd = [
-        "python",
-        str(builder),
-        "--pdf", str(pdf_path),
-        "--xlsx", str(xlsx_path),
-        "--out", str(out_html),
-        "--no-cache",
-    ]
-
     report(STAGE_TEXT["build_organizer"])
-    subprocess.check_call(cmd)
+    build_organizer(
+        str(pdf_path),
+        str(xlsx_path),
+        str(out_html),
+        no_cache=True,
+        progress_cb=lambda step: report(f"{STAGE_TEXT['build_organizer']} ({step})"),
+        page_texts=page_texts,
+    )
     report("Organizer ready.")
 
 
@@ -401,18 +723,38 @@ def run_stacker(
     out_pdf: str,
     date_label: str,
     progress_cb: Optional[Callable[..., None]] = None,
+    page_texts: Optional[list[str]] = None,
 ) -> Dict[str, Any]:
+    last_phase = None
+    last_sent_at = 0.0
+
     def cb(**payload: Any) -> None:
+        nonlocal last_phase, last_sent_at
+        # The stacker ticks per route; forward its phase changes ("Reading",
+        # "Processing", "Summary", ...) and the last route right away, and
+        # everything else at most every PAGE_REPORT_SECONDS. Its own stage name
+        # is only readable here, before the job stage replaces it.
+        phase = payload.get("stage")
+        total = payload.get("pages_total") or 0
+        now = time.monotonic()
+        if (
+            phase == last_phase
+            and not (total and payload.get("current_page", 0) >= total)
+            and now - last_sent_at < PAGE_REPORT_SECONDS
+        ):
+            return
+        last_phase = phase
+        last_sent_at = now
         payload["stage"] = "build_optisheets"
         payload.setdefault("msg", STAGE_TEXT["build_optisheets"])
-        if progress_cb:
-            progress_cb(**payload)
+        progress_cb(**payload)
 
     return build_stacked_pdf_with_summary_grouped(
         str(pdf_path),
         str(out_pdf),
         date_label,
         progress_cb=(cb if progress_cb else None),
+        page_texts=page_texts,
     )
 
 
@@ -422,13 +764,16 @@ class ProgressEmaStore:
         self.alpha = alpha
         self._lock = threading.Lock()
         self._data: Dict[str, float] = {}
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         self._load()
+        atexit.register(self.flush)
 
     def _load(self) -> None:
         if not self.path.exists():
             return
         try:
-            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            raw = orjson.loads(self.path.read_bytes())
         except Exception as exc:
             print(f"[progress-ema] Failed to load {self.path.name}: {exc}")
             return
@@ -444,6 +789,25 @@ class ProgressEmaStore:
         payload = {k: round(v, 3) for k, v in self._data.items()}
         _atomic_write_json(self.path, payload)
 
+    def _schedule_flush(self) -> None:
+        # Caller holds self._lock. Stage changes come in bursts; one write per window is plenty.
+        if self._flush_timer is not None:
+            return
+        timer = threading.Timer(EMA_FLUSH_SECONDS, self.flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save()
+
     def expected(self, stage: str) -> float:
         raw = self._data.get(stage, DEFAULT_STAGE_SECONDS.get(stage, 10.0))
         try:
@@ -474,7 +838,8 @@ class ProgressEmaStore:
                 new = observed
             new = max(EMA_EXPECTED_MIN_SECONDS, min(EMA_EXPECTED_MAX_SECONDS, new))
             self._data[stage] = float(new)
-            self._save()
+            self._dirty = True
+            self._schedule_flush()
 
 
 class JobStore:
@@ -489,7 +854,21 @@ class JobStore:
         print(f"[jobstore] root={self.root.resolve()} env_set={env_set}")
         self._lock = threading.Lock()
         self._jobs: Dict[str, Dict[str, Any]] = {}
+        # Outputs are never deleted once written, so a positive check is final.
+        self._outputs_done: set[str] = set()
+        self._outputs_checked: Dict[str, tuple[float, Dict[str, bool]]] = {}
+        # Last bytes written per job; progress ticks often repeat the same payload.
+        self._last_written: Dict[str, bytes] = {}
+        # Disk writes run outside self._lock; sequence numbers keep a slow, older
+        # snapshot from landing on top of a newer one.
+        self._write_lock = threading.Lock()
+        self._write_seq = 0
+        self._written_seq: Dict[str, int] = {}
+        # Progress ticks only update memory; these jobs are written on the next flush.
+        self._pending: set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
         self._ema = ProgressEmaStore(self.root / "progress_ema.json")
+        atexit.register(self.flush)
 
     def _job_dir(self, jid: str) -> Path:
         return self.root / jid
@@ -497,14 +876,54 @@ class JobStore:
     def _job_json(self, jid: str) -> Path:
         return self._job_dir(jid) / "job.json"
 
+    def _snapshot(self, jid: str, payload: Dict[str, Any]) -> tuple[int, bytes]:
+        # Caller holds self._lock.
+        self._write_seq += 1
+        self._pending.discard(jid)
+        return self._write_seq, orjson.dumps(payload)
+
+    def _write_snapshot(self, jid: str, seq: int, data: bytes) -> None:
+        # Called without self._lock so an fsync never stalls polls or progress ticks.
+        with self._write_lock:
+            if seq < self._written_seq.get(jid, 0):
+                return
+            self._written_seq[jid] = seq
+            if self._last_written.get(jid) == data:
+                return
+            _atomic_write_bytes(self._job_json(jid), data)
+            self._last_written[jid] = data
+
+    def _schedule_flush(self, jid: str) -> None:
+        # Caller holds self._lock.
+        self._pending.add(jid)
+        if self._flush_timer is not None:
+            return
+        timer = threading.Timer(JOB_FLUSH_SECONDS, self.flush)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            snapshots = [
+                (jid, *self._snapshot(jid, self._jobs[jid]))
+                for jid in list(self._pending)
+                if jid in self._jobs
+            ]
+            self._pending.clear()
+        for jid, seq, data in snapshots:
+            self._write_snapshot(jid, seq, data)
+
     def _read_payload_from_disk(self, jid: str) -> Optional[Dict[str, Any]]:
         jfile = self._job_json(jid)
         if not jfile.exists():
             return None
 
         try:
-            raw = jfile.read_text(encoding="utf-8")
-            payload = json.loads(raw)
+            payload = orjson.loads(jfile.read_bytes())
             if not isinstance(payload, dict):
                 raise ValueError("job.json payload is not an object")
         except Exception as exc:
@@ -517,20 +936,40 @@ class JobStore:
             }
 
         # If outputs exist, mark done (even after restart)
-        d = self._job_dir(jid)
-        outs = {
-            "xlsx": "Bags_with_Overflow.xlsx",
-            "html": "van_organizer.html",
-            "stacked": "STACKED.pdf",
-        }
-        if payload.get("status") == "error":
+        status = payload.get("status")
+        if status == "error":
             pass
-        elif all((d / v).exists() for v in outs.values()):
+        elif status == "done":
+            # Persisted by set() only after every output was written.
+            self._outputs_done.add(jid)
+        elif all(self._check_outputs(jid).values()):
             payload["status"] = "done"
-            payload["outputs"] = outs
+            payload["outputs"] = dict(JOB_OUTPUTS)
 
         return payload
 
+    def _check_outputs(self, jid: str) -> Dict[str, bool]:
+        if jid in self._outputs_done:
+            return {key: True for key in JOB_OUTPUTS}
+        d = self._job_dir(jid)
+        present = {key: (d / name).exists() for key, name in JOB_OUTPUTS.items()}
+        if all(present.values()):
+            self._outputs_done.add(jid)
+        self._outputs_checked[jid] = (_monotonic_seconds(), present)
+        return present
+
+    def outputs_present(self, jid: str) -> Dict[str, bool]:
+        """
+        Which of JOB_OUTPUTS exist for a job. Status polls call this every tick, so
+        a partial result is reused for OUTPUTS_RECHECK_SECONDS before re-statting.
+        """
+        cached = self._outputs_checked.get(jid)
+        if jid not in self._outputs_done and cached is not None:
+            checked_at, present = cached
+            if _monotonic_seconds() - checked_at < OUTPUTS_RECHECK_SECONDS:
+                return dict(present)
+        return self._check_outputs(jid)
+
     def create(self) -> str:
         jid = uuid.uuid4().hex[:10]
         d = self._job_dir(jid)
@@ -548,9 +987,10 @@ class JobStore:
             "error": None,
             "outputs": None,
         }
-        _atomic_write_json(self._job_json(jid), payload)
         with self._lock:
             self._jobs[jid] = payload
+            snapshot = self._snapshot(jid, payload)
+        self._write_snapshot(jid, *snapshot)
         return jid
 
     def path(self, jid: str) -> Path:
@@ -577,8 +1017,12 @@ class JobStore:
             payload.update(patch)
             d = self._job_dir(jid)
             d.mkdir(parents=True, exist_ok=True)
-            _atomic_write_json(self._job_json(jid), payload)
             self._jobs[jid] = payload
+            if payload.get("status") == "done":
+                # process_job only marks a job done after writing every output.
+                self._outputs_done.add(jid)
+            snapshot = self._snapshot(jid, payload)
+        self._write_snapshot(jid, *snapshot)
 
     def set_progress(self, jid: str, payload: Dict[str, Any]):
         payload = {k: v for k, v in payload.items() if v is not None}
@@ -618,8 +1062,8 @@ class JobStore:
                 merged["pct"] = _clamp_pct(merged["pct"])
 
             job_payload["progress"] = merged
-            _atomic_write_json(self._job_json(jid), job_payload)
             self._jobs[jid] = job_payload
+            self._schedule_flush(jid)
 
     def complete_current_stage(self, jid: str) -> None:
         progress = self.get(jid).get("progress") or {}
@@ -640,8 +1084,9 @@ class JobStore:
             },
         )
 
-    def compute_progress_percent(self, jid: str) -> tuple[int, str]:
-        job = self.get(jid)
+    def compute_progress_percent(self, jid: str, job: Optional[Dict[str, Any]] = None) -> tuple[int, str]:
+        if job is None:
+            job = self.get(jid)
         status = job.get("status")
         progress = job.get("progress") or {}
         stage = progress.get("stage")
@@ -696,29 +1141,65 @@ def process_job(store: JobStore, jid: str) -> None:
             store.set_progress(jid, payload)
 
         # 1) Excel
-        generate_bags_xlsx_from_routesheets(str(pdf_path), str(xlsx_path), progress_cb=cb)
+        xlsx_info = generate_bags_xlsx_from_routesheets(str(pdf_path), str(xlsx_path), progress_cb=cb)
 
         # 2) Stacked PDF (with progress callback)
         cb(stage="build_optisheets", msg=STAGE_TEXT["build_optisheets"])
-        date_label = auto_detect_date_label(str(pdf_path))
-
-        def stack_cb(**payload):
-            payload["stage"] = "build_optisheets"
-            payload.setdefault("msg", STAGE_TEXT["build_optisheets"])
-            store.set_progress(jid, payload)
+        date_label = xlsx_info.get("date_label") or "DATE UNKNOWN"
+        # Every later stage re-reads the same pages; hand them the text we already have.
+        page_texts = xlsx_info.get("page_texts")
+
+        # The organizer builds on a side thread while the stacker owns "stage"/"msg",
+        # so its steps land in "organizer_msg" and only take over "msg" once the
+        # job reaches the build_organizer stage.
+        organizer_lock = threading.Lock()
+        organizer_state = {"msg": None, "current": False}
+
+        def organizer_cb(**payload):
+            msg = payload.get("msg")
+            with organizer_lock:
+                organizer_state["msg"] = msg
+                if organizer_state["current"]:
+                    cb(stage="build_organizer", msg=msg, organizer_msg=msg)
+                else:
+                    store.set_progress(jid, {"organizer_msg": msg})
 
-        stack_results = run_stacker(str(pdf_path), str(stacked_pdf), date_label, progress_cb=stack_cb)
-        toc_entries = (stack_results or {}).get("toc_entries", [])
         wave_images = [
             p
             for p in job_dir.glob("wave_image_*")
             if p.suffix.lower() in {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff"}
         ]
-        wave_colors = extract_wave_color_map(wave_images, toc_entries)
-
-        # 3) HTML
-        cb(stage="build_organizer", msg=STAGE_TEXT["build_organizer"])
-        run_builder_html(str(pdf_path), str(xlsx_path), str(html_path), progress_cb=cb)
+        # Wave images come from the upload, so band detection can overlap the stacker;
+        # only the band -> wave-time mapping has to wait for its TOC. The organizer
+        # only needs the workbook and page text, so it runs alongside as well: the
+        # stacker spends much of its time in PyMuPDF and file writes, which leave the
+        # GIL free for the builder's pdfplumber work.
+        with ThreadPoolExecutor(max_workers=2) as side_pool:
+            bands_future = side_pool.submit(detect_wave_bands, wave_images) if wave_images else None
+            html_future = side_pool.submit(
+                run_builder_html,
+                str(pdf_path),
+                str(xlsx_path),
+                str(html_path),
+                progress_cb=organizer_cb,
+                page_texts=page_texts,
+            )
+            stack_results = run_stacker(
+                str(pdf_path),
+                str(stacked_pdf),
+                date_label,
+                progress_cb=cb,
+                page_texts=page_texts,
+            )
+            wave_bands = bands_future.result() if bands_future else []
+            toc_entries = (stack_results or {}).get("toc_entries", [])
+            wave_colors = extract_wave_color_map(wave_images, toc_entries, detected_bands=wave_bands)
+
+            # 3) HTML
+            with organizer_lock:
+                organizer_state["current"] = True
+                cb(stage="build_organizer", msg=organizer_state["msg"] or STAGE_TEXT["build_organizer"])
+            html_future.result()
 
         store.complete_current_stage(jid)
         store.set(
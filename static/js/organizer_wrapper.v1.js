@@ -0,0 +1,126 @@
+(function () {
+  var frame = document.getElementById("orgFrame");
+  var jid = frame.dataset.jid;
+  var params = new URLSearchParams(window.location.search);
+  var routeParam = params.get("route");
+  // cache-bust iframe so it always pulls the newest organizer without manual refresh
+  var src = "/job/" + jid + "/organizer_raw?v=" + Date.now();
+  if(routeParam){
+    src += "&route=" + encodeURIComponent(routeParam);
+  }
+  frame.src = src;
+})();
+(function(){
+  var root = document.documentElement;
+  setTimeout(function(){
+    root.classList.add("bannerMin");
+  }, 3000);
+
+  var hudTitle = document.getElementById("hudTitle");
+  var pillBags = document.getElementById("hudPillBags");
+  var pillOverflow = document.getElementById("hudPillOverflow");
+  var hudRight = document.querySelector(".hudRight");
+  var hudWrap = document.getElementById("bannerHUD");
+  var iframe = document.getElementById("orgFrame");
+  var lastBags = null;
+  var lastBagsLoaded = 0;
+  var lastOverflow = null;
+  var lastOverflowLoaded = 0;
+  var lastFooterWidth = 0;
+  var activeHudTab = "bags_overflow";
+
+  document.querySelectorAll(".hudTab").forEach(function(btn){
+    btn.addEventListener("click", function(){
+      document.querySelectorAll(".hudTab").forEach(function(b){ b.classList.remove("active"); });
+      btn.classList.add("active");
+      activeHudTab = btn.dataset.tab || "bags_overflow";
+      updateHudPillVisibility();
+      if(iframe && iframe.contentWindow){
+        iframe.contentWindow.postMessage({ type:"setTab", tab: btn.dataset.tab }, "*");
+      }
+    });
+  });
+  var defaultTab = document.querySelector('.hudTab[data-tab="bags_overflow"]');
+  if(defaultTab) defaultTab.classList.add("active");
+  updateHudPillVisibility();
+
+  function shouldShowBags(){
+    return activeHudTab === "bags" || activeHudTab === "bags_overflow";
+  }
+
+  function shouldShowOverflow(){
+    return activeHudTab === "overflow" || activeHudTab === "bags_overflow";
+  }
+
+  function applyHudStacking(){
+    var selectedCount = parseInt(lastBagsLoaded || 0, 10);
+    var footerWidth = parseInt(lastFooterWidth || 0, 10);
+    var shouldStack = selectedCount > 0;
+    var allowStack = activeHudTab === "bags" || activeHudTab === "bags_overflow";
+    if(hudRight) hudRight.classList.toggle("stacked", shouldStack && allowStack);
+    if(hudWrap){
+      if(shouldStack && allowStack && footerWidth > 0){
+        hudWrap.style.setProperty("--hud-pill-target-width", footerWidth + "px");
+      }else{
+        hudWrap.style.removeProperty("--hud-pill-target-width");
+      }
+    }
+  }
+
+  function updateHudPillVisibility(){
+    if(pillBags) pillBags.style.display = shouldShowBags() ? "inline-flex" : "none";
+    if(pillOverflow) pillOverflow.style.display = shouldShowOverflow() ? "inline-flex" : "none";
+    applyHudStacking();
+  }
+
+  window.addEventListener("message", function(ev){
+    var d = ev.data || {};
+    if(d.type !== "routeMeta") return;
+
+    if(hudTitle) hudTitle.textContent = d.title || "—";
+
+    function formatProgress(total, selected, label){
+      if(total === undefined || total === null) return "—";
+      var totalNum = parseInt(total, 10);
+      if(Number.isNaN(totalNum)) return "—";
+      var selectedNum = parseInt(selected, 10);
+      if(Number.isNaN(selectedNum)) selectedNum = 0;
+      var suffix = label ? " " + label : "";
+      if(selectedNum <= 0){
+        return totalNum + suffix;
+      }
+      var remaining = Math.max(totalNum - selectedNum, 0);
+      return selectedNum + "/" + totalNum + suffix + " (" + remaining + " left)";
+    }
+
+    function setPillProgress(pill, total, selected){
+      if(!pill) return;
+      var totalNum = parseInt(total, 10);
+      if(Number.isNaN(totalNum) || totalNum <= 0){
+        pill.style.setProperty("--pill-progress", "0%");
+        return;
+      }
+      var selectedNum = parseInt(selected, 10);
+      if(Number.isNaN(selectedNum)) selectedNum = 0;
+      var pct = Math.max(0, Math.min(selectedNum / totalNum, 1));
+      pill.style.setProperty("--pill-progress", (pct * 100).toFixed(1) + "%");
+    }
+
+    if(d.bags !== undefined && d.bags !== null) lastBags = d.bags;
+    if(d.bags_loaded !== undefined && d.bags_loaded !== null) lastBagsLoaded = d.bags_loaded;
+    if(d.overflow !== undefined && d.overflow !== null) lastOverflow = d.overflow;
+    if(d.overflow_loaded !== undefined && d.overflow_loaded !== null) lastOverflowLoaded = d.overflow_loaded;
+    if(d.footer_pill_width !== undefined && d.footer_pill_width !== null) lastFooterWidth = d.footer_pill_width;
+
+    var bags = lastBags;
+    var bagsLoaded = lastBagsLoaded;
+    if(pillBags) pillBags.textContent = formatProgress(bags, bagsLoaded, "bags");
+    setPillProgress(pillBags, bags, bagsLoaded);
+    var overflow = lastOverflow;
+    var overflowLoaded = lastOverflowLoaded;
+    if(pillOverflow) pillOverflow.textContent = formatProgress(overflow, overflowLoaded, "overflow");
+    setPillProgress(pillOverflow, overflow, overflowLoaded);
+    applyHudStacking();
+
+  });
+})();
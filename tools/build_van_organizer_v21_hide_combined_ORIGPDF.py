@@ -13,27 +13,44 @@ Optimizations (no output/UX changes):
 from __future__ import annotations
 import argparse
 import datetime as _dt
-import json
 import os
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Sequence, Tuple, Optional
 
 import openpyxl
+import orjson
 import pdfplumber
 
 
 CACHE_VERSION_PDF = 3
 CACHE_VERSION_ROUTES = 3
 
+# Pages per process-pool task, and the fewest pages worth a pool for, here and in the
+# web app's page-text pass: a spawned child takes ~0.7 s to start against ~25 ms to
+# extract or lay out one page, so smaller documents finish sooner in-process.
+PARSE_PAGES_PER_TASK = 4
+PARALLEL_PARSE_MIN_PAGES = 48
+DEFAULT_PARSE_WORKERS_MAX = 4
+
 # ----------------------------- Regex (precompiled) -----------------------------
-PAT_HEADER = re.compile(r'\b(DDF\d+)\s*·\s*([A-Z]{3},\s*[A-Z]{3}\s+\d{1,2},\s+\d{4})\b')
-PAT_DATE_ONLY = re.compile(r'\b([A-Z]{3},\s*[A-Z]{3}\s+\d{1,2},\s+\d{4})\b')
+PAT_HEADER = re.compile(r'\b(?P<ddf>DDF\d+)\s*·\s*(?P<date>[A-Z]{3},\s*[A-Z]{3}\s+\d{1,2},\s+\d{4})\b')
+# First "DDF# · date" header or bare date, whichever comes first; ddf is None for a bare date.
+PAT_HEADER_OR_DATE = re.compile(r'(?:\b(?P<ddf>DDF\d+)\s*·\s*)?\b(?P<date>[A-Z]{3},\s*[A-Z]{3}\s+\d{1,2},\s+\d{4})\b')
 PAT_FILE_DATE = re.compile(r'(\d{2})_(\d{2})_(\d{4})')
 
-PAT_ROW_FULL = re.compile(r'^\s*(\d+)\s+([A-Z]-\d+(?:\.\d+)?[A-Z]?)\s+([A-Za-z]+)\s+([0-9A-Za-z]+)\s+(\d+)(?:\s+|$)')
-PAT_ROW_NOSZ = re.compile(r'^\s*(\d+)\s+([A-Za-z]+)\s+([0-9A-Za-z]+)\s+(\d+)(?:\s+|$)')
+# Bag row, with or without the sort zone: idx [sort_zone] word alnum pkgs ...
+PAT_ROW = re.compile(
+    r'^\s*(?P<idx>\d+)\s+(?:(?P<sz>[A-Z]-\d+(?:\.\d+)?[A-Z]?)\s+)?[A-Za-z]+\s+[0-9A-Za-z]+\s+(?P<pkgs>\d+)(?:\s+|$)'
+)
 PAT_TIME = re.compile(r'\b(\d{1,2}:\d{2}\s*[AP]M)\b')
+PAT_TIME_HHMM = re.compile(r'^(\d{1,2}):(\d{2})\s*([AP]M)$')
+PAT_ROUTE_SHORT = re.compile(r'^([A-Z]+)\.(\d+)$')
+PAT_SPACES = re.compile(r'\s+')
 
 PAT_OV_ZONE_CNT = re.compile(r'^([0-9]+\.[0-9]+[A-Z])\s*\((\d+)\)\s*$')
 PAT_OV_ZONE = re.compile(r'^([0-9]+\.[0-9]+[A-Z])')
@@ -41,9 +58,10 @@ SHEET_RE = re.compile(r'^([A-Z]\.\d+)_?(CX\d+)$')
 
 
 # ----------------------------- Helpers -----------------------------
+@lru_cache(maxsize=128)
 def _time_to_minutes(t: str) -> Optional[int]:
     t = (t or "").strip().upper()
-    m = re.match(r'^(\d{1,2}):(\d{2})\s*([AP]M)$', t)
+    m = PAT_TIME_HHMM.match(t)
     if not m:
         return None
     hh = int(m.group(1))
@@ -59,7 +77,7 @@ def _time_to_minutes(t: str) -> Optional[int]:
 
 
 def _sort_route_short(rs: str) -> Tuple[str, int]:
-    m = re.match(r'^([A-Z]+)\.(\d+)$', rs or "")
+    m = PAT_ROUTE_SHORT.match(rs or "")
     if not m:
         return (rs or "", 0)
     return (m.group(1), int(m.group(2)))
@@ -81,6 +99,21 @@ def _parse_zone_counts(zones_str: str) -> List[Tuple[str, int]]:
     return out
 
 
+@lru_cache(maxsize=8)
+def _stat_tuple(path: str) -> Tuple[int, int]:
+    """(size, whole-second mtime) for cache validation; cleared per build_organizer call."""
+    st = os.stat(path)
+    return st.st_size, int(st.st_mtime)
+
+
+def _write_cache(cache_path: Path, payload: dict) -> None:
+    # Write then rename, so an interrupted run never leaves a truncated cache behind.
+    # NON_STR_KEYS stringifies the int bag indices the way json.dumps did.
+    tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp, cache_path)
+
+
 def _cache_path_for(pdf_path: str) -> Path:
     p = Path(pdf_path)
     return p.with_suffix(p.suffix + ".vanorg_cache.json")
@@ -91,19 +124,23 @@ def _load_pdf_cache(pdf_path: str) -> Optional[dict]:
     if not cache_path.exists():
         return None
     try:
-        st = os.stat(pdf_path)
-        with cache_path.open("r", encoding="utf-8") as f:
-            obj = json.load(f)
+        size, mtime = _stat_tuple(pdf_path)
+        obj = orjson.loads(cache_path.read_bytes())
         meta = obj.get("meta", {})
         if meta.get("v") != CACHE_VERSION_PDF:
             return None
-        if meta.get("size") != st.st_size:
+        if meta.get("size") != size:
             return None
-        if meta.get("mtime") != int(st.st_mtime):
+        if meta.get("mtime") != mtime:
             return None
         data = obj.get("data")
         if not data or not data.get("pdf_meta"):
             return None
+        # JSON object keys are strings; bag indices are looked up as ints.
+        data["pdf_meta"] = {
+            rs: {int(idx): meta for idx, meta in by_idx.items()}
+            for rs, by_idx in data["pdf_meta"].items()
+        }
         return data
     except Exception:
         return None
@@ -111,13 +148,13 @@ def _load_pdf_cache(pdf_path: str) -> Optional[dict]:
 
 def _save_pdf_cache(pdf_path: str, data: dict) -> None:
     try:
-        st = os.stat(pdf_path)
+        size, mtime = _stat_tuple(pdf_path)
         cache_path = _cache_path_for(pdf_path)
         payload = {
-            "meta": {"v": CACHE_VERSION_PDF, "size": st.st_size, "mtime": int(st.st_mtime)},
+            "meta": {"v": CACHE_VERSION_PDF, "size": size, "mtime": mtime},
             "data": data,
         }
-        cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        _write_cache(cache_path, payload)
     except Exception:
         pass
 def _routes_cache_path_for(xlsx_path: str) -> Path:
@@ -130,16 +167,15 @@ def _load_routes_cache(pdf_path: str, xlsx_path: str) -> Optional[dict]:
     if not cache_path.exists():
         return None
     try:
-        pst = os.stat(pdf_path)
-        xst = os.stat(xlsx_path)
-        with cache_path.open("r", encoding="utf-8") as f:
-            obj = json.load(f)
+        pdf_size, pdf_mtime = _stat_tuple(pdf_path)
+        xlsx_size, xlsx_mtime = _stat_tuple(xlsx_path)
+        obj = orjson.loads(cache_path.read_bytes())
         meta = obj.get("meta", {})
         if meta.get("v") != CACHE_VERSION_ROUTES:
             return None
-        if meta.get("pdf_size") != pst.st_size or meta.get("pdf_mtime") != int(pst.st_mtime):
+        if meta.get("pdf_size") != pdf_size or meta.get("pdf_mtime") != pdf_mtime:
             return None
-        if meta.get("xlsx_size") != xst.st_size or meta.get("xlsx_mtime") != int(xst.st_mtime):
+        if meta.get("xlsx_size") != xlsx_size or meta.get("xlsx_mtime") != xlsx_mtime:
             return None
         data = obj.get("data")
         if not data or not data.get("routes"):
@@ -151,18 +187,18 @@ def _load_routes_cache(pdf_path: str, xlsx_path: str) -> Optional[dict]:
 
 def _save_routes_cache(pdf_path: str, xlsx_path: str, data: dict) -> None:
     try:
-        pst = os.stat(pdf_path)
-        xst = os.stat(xlsx_path)
+        pdf_size, pdf_mtime = _stat_tuple(pdf_path)
+        xlsx_size, xlsx_mtime = _stat_tuple(xlsx_path)
         cache_path = _routes_cache_path_for(xlsx_path)
         payload = {
             "meta": {
                 "v": CACHE_VERSION_ROUTES,
-                "pdf_size": pst.st_size, "pdf_mtime": int(pst.st_mtime),
-                "xlsx_size": xst.st_size, "xlsx_mtime": int(xst.st_mtime),
+                "pdf_size": pdf_size, "pdf_mtime": pdf_mtime,
+                "xlsx_size": xlsx_size, "xlsx_mtime": xlsx_mtime,
             },
             "data": data,
         }
-        cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        _write_cache(cache_path, payload)
     except Exception:
         pass
 
@@ -189,14 +225,150 @@ def _extract_pkg_summaries(lines: List[str]) -> Tuple[Optional[int], Optional[in
     return commercial, total
 
 
+def _group_words_into_lines(words: List[dict], y_tol: float = 2.0) -> List[str]:
+    if not words:
+        return []
+    # Bucket by exact top, then sweep the (few) distinct tops: a line starts at a
+    # top and takes every later top within y_tol of it.
+    by_top: Dict[float, List[dict]] = {}
+    for w in words:
+        y = float(w.get("top", 0.0))
+        bucket = by_top.get(y)
+        if bucket is None:
+            by_top[y] = [w]
+        else:
+            bucket.append(w)
+
+    lines: List[List[dict]] = []
+    cur: List[dict] = []
+    cur_y: Optional[float] = None
+    for y in sorted(by_top):
+        if cur_y is not None and abs(y - cur_y) <= y_tol:
+            cur.extend(by_top[y])
+        else:
+            if cur:
+                lines.append(cur)
+            cur = list(by_top[y])
+            cur_y = y
+    if cur:
+        lines.append(cur)
+
+    out_lines: List[str] = []
+    for ln in lines:
+        ln_sorted = sorted(ln, key=lambda w: float(w.get("x0", 0.0)))
+        text = " ".join((w.get("text") or "").strip() for w in ln_sorted if (w.get("text") or "").strip())
+        text = PAT_SPACES.sub(" ", text).strip()
+        if text:
+            out_lines.append(text)
+    return out_lines
+
+
+def _is_route_meta_text(page_text: str) -> bool:
+    return "Sort Zone" in page_text and "Pkgs" in page_text
+
+
+RouteMetaPage = Tuple[str, Optional[int], Optional[int], Optional[str], List[Tuple[int, Optional[str], int]]]
+
+
+def _parse_route_meta_page(page, page_text: str) -> Optional[RouteMetaPage]:
+    """
+    (route_short, commercial_pkgs, total_pkgs, wave_time, rows) for one route page,
+    rows being (idx, sort_zone or None, pkgs). None if the page isn't a route page.
+    """
+    if not _is_route_meta_text(page_text):
+        return None
+
+    lines_quick = [ln.strip() for ln in page_text.splitlines() if ln and ln.strip()]
+    route_short = ""
+    for ln in lines_quick[:20]:
+        if ln.startswith("STG."):
+            route_short = ln.replace("STG.", "").strip()
+            break
+    # Bag rows need the words regardless, so the STG. fallback searches the same list.
+    words = page.extract_words(use_text_flow=True, keep_blank_chars=False) or []
+    if not route_short:
+        for w in words:
+            t = (w.get("text") or "").strip()
+            if t.startswith("STG."):
+                route_short = t.replace("STG.", "").strip()
+                break
+    if not route_short:
+        return None
+
+    comm_pkgs, total_pkgs = _extract_pkg_summaries(lines_quick)
+    tm = PAT_TIME.search(page_text)
+    wave_time = tm.group(1).upper() if tm else None
+
+    rows: List[Tuple[int, Optional[str], int]] = []
+    for ln in _group_words_into_lines(words, y_tol=2.0):
+        m = PAT_ROW.match(ln)
+        if m:
+            rows.append((int(m.group("idx")), m.group("sz"), int(m.group("pkgs"))))
+    return route_short, comm_pkgs, total_pkgs, wave_time, rows
+
+
+def _parse_route_meta_pages(
+    pdf,
+    page_indices: Sequence[int],
+    texts: Optional[Sequence[str]] = None,
+) -> List[RouteMetaPage]:
+    """Route pages among page_indices of an open PDF; texts, if given, line up with page_indices."""
+    parsed: List[RouteMetaPage] = []
+    for k, page_index in enumerate(page_indices):
+        page = pdf.pages[page_index]
+        page_text = texts[k] if texts is not None else (page.extract_text() or "")
+        result = _parse_route_meta_page(page, page_text)
+        page.close()
+        if result is not None:
+            parsed.append(result)
+    return parsed
+
+
+def _parse_route_meta_chunk(
+    pdf_path: str,
+    page_indices: Sequence[int],
+    texts: Optional[Sequence[str]] = None,
+) -> List[RouteMetaPage]:
+    with pdfplumber.open(pdf_path) as pdf:
+        return _parse_route_meta_pages(pdf, page_indices, texts)
+
+
+def _default_parse_workers() -> int:
+    # cpu_count() reports the host's cores inside a container; affinity at least
+    # honours cpusets. Each spawned child re-imports pdfplumber and friends (~100 MB),
+    # so stay at DEFAULT_PARSE_WORKERS_MAX regardless to fit small instances.
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    return min(cpus, DEFAULT_PARSE_WORKERS_MAX)
+
+
+def parse_workers() -> int:
+    """
+    Process count for page-parse pools, here and in the web app's pipeline. Set
+    VANORG_PARSE_WORKERS to override the capped default (1 disables the pools).
+    """
+    raw = os.environ.get("VANORG_PARSE_WORKERS")
+    try:
+        workers = int(raw) if raw else _default_parse_workers()
+    except ValueError:
+        workers = _default_parse_workers()
+    return max(1, workers)
+
+
 def parse_pdf_meta(
     pdf_path: str,
     use_cache: bool = True,
+    page_texts: Optional[List[str]] = None,
 ) -> Tuple[str, str, Dict[str, Dict[int, dict]], Dict[str, str], Dict[str, dict]]:
     """
     Returns:
       header_title, route_code, pdf_meta[route_short][idx] = {sort_zone, pkgs},
       route_time[route_short] = "11:20 AM", pkg_summary[route_short] = {commercial, total}
+
+    page_texts, if given, is each page's extract_text() output from an earlier pass;
+    pages are then only laid out when their words are actually needed.
     """
     if use_cache:
         cached = _load_pdf_cache(pdf_path)
@@ -217,110 +389,73 @@ def parse_pdf_meta(
     route_time: Dict[str, str] = {}
     pkg_summary: Dict[str, dict] = {}
 
-    def _group_words_into_lines(words: List[dict], y_tol: float = 2.0) -> List[str]:
-        if not words:
-            return []
-        words = sorted(words, key=lambda w: (float(w.get("top", 0.0)), float(w.get("x0", 0.0))))
-        lines: List[List[dict]] = []
-        cur: List[dict] = []
-        cur_y: Optional[float] = None
-
-        for w in words:
-            y = float(w.get("top", 0.0))
-            if cur_y is None:
-                cur_y = y
-                cur = [w]
-                continue
-            if abs(y - cur_y) <= y_tol:
-                cur.append(w)
-            else:
-                lines.append(cur)
-                cur = [w]
-                cur_y = y
-        if cur:
-            lines.append(cur)
-
-        out_lines: List[str] = []
-        for ln in lines:
-            ln_sorted = sorted(ln, key=lambda w: float(w.get("x0", 0.0)))
-            text = " ".join((w.get("text") or "").strip() for w in ln_sorted if (w.get("text") or "").strip())
-            text = re.sub(r"\s+", " ", text).strip()
-            if text:
-                out_lines.append(text)
-        return out_lines
-
     with pdfplumber.open(pdf_path) as pdf:
-        t0 = (pdf.pages[0].extract_text() or "")
-        m = PAT_HEADER.search(t0)
+        if page_texts is not None and len(page_texts) != len(pdf.pages):
+            page_texts = None
+        t0 = page_texts[0] if page_texts is not None else (pdf.pages[0].extract_text() or "")
+        m = PAT_HEADER_OR_DATE.search(t0)
+        if m and m.group("ddf") is None:
+            # A full header further down still beats a bare date.
+            m = PAT_HEADER.search(t0, m.end()) or m
         if m:
-            route_code = m.group(1)
-            date_str = m.group(2).upper()
+            route_code = m.group("ddf") or route_code
+            date_str = m.group("date").upper()
         else:
-            m2 = PAT_DATE_ONLY.search(t0)
-            if m2:
-                date_str = m2.group(1).upper()
-            else:
-                m3 = PAT_FILE_DATE.search(pdf_path)
-                if m3:
-                    mm, dd, yyyy = map(int, m3.groups())
-                    dt = _dt.date(yyyy, mm, dd)
-                    date_str = dt.strftime("%a, %b %d, %Y").upper()
+            m3 = PAT_FILE_DATE.search(pdf_path)
+            if m3:
+                mm, dd, yyyy = map(int, m3.groups())
+                dt = _dt.date(yyyy, mm, dd)
+                date_str = dt.strftime("%a, %b %d, %Y").upper()
         header_title = f"{route_code} • {date_str}".strip(" •")
 
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            if "Sort Zone" not in page_text or "Pkgs" not in page_text:
-                continue
-
-            lines_quick = [ln.strip() for ln in page_text.splitlines() if ln and ln.strip()]
-            route_short = ""
-            for ln in lines_quick[:20]:
-                if ln.startswith("STG."):
-                    route_short = ln.replace("STG.", "").strip()
-                    break
-            if not route_short:
-                words0 = page.extract_words(use_text_flow=True, keep_blank_chars=False) or []
-                for w in words0:
-                    t = (w.get("text") or "").strip()
-                    if t.startswith("STG."):
-                        route_short = t.replace("STG.", "").strip()
-                        break
-            if not route_short:
-                continue
+        if page_texts is not None:
+            # Only pages passing the cheap text gate need a layout pass.
+            page_indices = [i for i, text in enumerate(page_texts) if _is_route_meta_text(text)]
+            texts: Optional[List[str]] = [page_texts[i] for i in page_indices]
+        else:
+            page_indices = list(range(len(pdf.pages)))
+            texts = None
 
-            comm_pkgs, total_pkgs = _extract_pkg_summaries(lines_quick)
-            if comm_pkgs is not None or total_pkgs is not None:
-                summary = pkg_summary.get(route_short) or {}
-                if comm_pkgs is not None:
-                    summary["commercial"] = comm_pkgs
-                if total_pkgs is not None:
-                    summary["total"] = total_pkgs
-                pkg_summary[route_short] = summary
-
-            if route_short not in route_time:
-                tm = PAT_TIME.search(page_text)
-                if tm:
-                    route_time[route_short] = tm.group(1).upper()
-
-            meta_by_idx = pdf_meta.get(route_short)
-            if meta_by_idx is None:
-                meta_by_idx = {}
-                pdf_meta[route_short] = meta_by_idx
-
-            words = page.extract_words(use_text_flow=True, keep_blank_chars=False) or []
-            line_texts = _group_words_into_lines(words, y_tol=2.0)
-
-            for ln in line_texts:
-                m = PAT_ROW_FULL.match(ln)
-                if m:
-                    idx = int(m.group(1))
-                    meta_by_idx[idx] = {"sort_zone": m.group(2), "pkgs": int(m.group(5))}
-                    continue
-                m2 = PAT_ROW_NOSZ.match(ln)
-                if m2:
-                    idx = int(m2.group(1))
-                    if idx not in meta_by_idx:
-                        meta_by_idx[idx] = {"sort_zone": "", "pkgs": int(m2.group(4))}
+        workers = parse_workers()
+        if workers <= 1 or len(page_indices) < PARALLEL_PARSE_MIN_PAGES:
+            parsed = _parse_route_meta_pages(pdf, page_indices, texts)
+        else:
+            parsed = None
+
+    if parsed is None:
+        # extract_words dominates and is CPU-bound, so fan page chunks out to
+        # processes; "spawn" keeps this safe when called from a threaded server.
+        starts = range(0, len(page_indices), PARSE_PAGES_PER_TASK)
+        index_chunks = [page_indices[i:i + PARSE_PAGES_PER_TASK] for i in starts]
+        text_chunks = [texts[i:i + PARSE_PAGES_PER_TASK] if texts is not None else None for i in starts]
+        ctx = multiprocessing.get_context("spawn")
+        parsed = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            # map() yields in submission order, so pages stay in document order.
+            for chunk in pool.map(_parse_route_meta_chunk, repeat(pdf_path), index_chunks, text_chunks):
+                parsed.extend(chunk)
+
+    # Merge in page order: the first wave time and the last package summary per
+    # route win, and sort-zone rows override earlier rows without one.
+    for route_short, comm_pkgs, total_pkgs, wave_time, rows in parsed:
+        if comm_pkgs is not None or total_pkgs is not None:
+            summary = pkg_summary.get(route_short) or {}
+            if comm_pkgs is not None:
+                summary["commercial"] = comm_pkgs
+            if total_pkgs is not None:
+                summary["total"] = total_pkgs
+            pkg_summary[route_short] = summary
+
+        if wave_time:
+            route_time.setdefault(route_short, wave_time)
+
+        meta_by_idx = pdf_meta.setdefault(route_short, {})
+
+        for idx, sort_zone, pkgs in rows:
+            if sort_zone is not None:
+                meta_by_idx[idx] = {"sort_zone": sort_zone, "pkgs": pkgs}
+            elif idx not in meta_by_idx:
+                meta_by_idx[idx] = {"sort_zone": "", "pkgs": pkgs}
 
     if use_cache and pdf_meta:
         _save_pdf_cache(pdf_path, {
@@ -334,6 +469,12 @@ def parse_pdf_meta(
     return header_title, route_code, pdf_meta, route_time, pkg_summary
 
 
+def _wave_times_in_order(routes: List[dict]) -> List[str]:
+    # One _time_to_minutes per distinct wave time, not per route; unparseable times last.
+    minutes = {t: _time_to_minutes(t) or 10**9 for t in {r.get("wave_time", "") for r in routes} if t}
+    return sorted(minutes, key=minutes.__getitem__)
+
+
 def parse_excel_routes(
     xlsx_path: str,
     pdf_meta: Dict[str, Dict[int, dict]],
@@ -342,14 +483,11 @@ def parse_excel_routes(
 ) -> List[dict]:
     wb = openpyxl.load_workbook(xlsx_path, data_only=True, read_only=True)
 
+    # SHEET_RE only matches route sheets (<RS>_<CX>), which also rules out any INDEX sheet.
+    route_sheets = [(name, m.group(1), m.group(2)) for name in wb.sheetnames if (m := SHEET_RE.match(name))]
+
     routes: List[dict] = []
-    for sheet_name in wb.sheetnames:
-        if sheet_name == "INDEX":
-            continue
-        m = SHEET_RE.match(sheet_name)
-        if not m:
-            continue
-        rs, cx = m.group(1), m.group(2)
+    for sheet_name, rs, cx in route_sheets:
         ws = wb[sheet_name]
 
         combined: List[dict] = []
@@ -374,11 +512,13 @@ def parse_excel_routes(
             zones_s = "" if zones is None else str(zones).strip()
 
             total_val = None
-            if total_cell is not None:
+            if isinstance(total_cell, (int, float)):
+                # Excel might store as float
+                total_val = int(total_cell)
+            elif total_cell is not None:
                 tc_s = str(total_cell).strip()
                 if tc_s:
-                    # Excel might store as float
-                    total_val = int(float(total_cell))
+                    total_val = int(float(tc_s))
 
             zone_counts = _parse_zone_counts(zones_s)
             zone_total = sum(cnt for _, cnt in zone_counts)
@@ -398,17 +538,16 @@ def parse_excel_routes(
         overflow_agg = [{"zone": k, "count": v} for k, v in sorted(ov_agg.items(), key=lambda x: x[0])]
 
         meta_by_idx = pdf_meta.get(rs, {})
-        bags_detail: List[dict] = []
-        for i, bag in enumerate(bags, start=1):
-            bag_id = bag.split(" ", 1)[1] if " " in bag else bag
-            meta = meta_by_idx.get(i)
-            bags_detail.append({
+        bags_detail: List[dict] = [
+            {
                 "idx": i,
                 "bag": bag,
-                "bag_id": bag_id,
-                "sort_zone": meta["sort_zone"] if meta else "",
+                "bag_id": bag.split(" ", 1)[1] if " " in bag else bag,
+                "sort_zone": meta["sort_zone"] if (meta := meta_by_idx.get(i)) else "",
                 "pkgs": meta["pkgs"] if meta else None
-            })
+            }
+            for i, bag in enumerate(bags, start=1)
+        ]
 
         pkg_info = pkg_summary.get(rs) or {}
         total_pkgs = pkg_info.get("total")
@@ -432,7 +571,7 @@ def parse_excel_routes(
         })
 
     # Sort: wave time group order then alpha+numeric route_short
-    times_sorted = sorted({r.get("wave_time", "") for r in routes if r.get("wave_time", "")}, key=lambda x: _time_to_minutes(x) or 10**9)
+    times_sorted = _wave_times_in_order(routes)
     wave_rank = {t: i for i, t in enumerate(times_sorted, start=1)}
 
     def _route_sort_key(r: dict):
@@ -444,7 +583,7 @@ def parse_excel_routes(
 
 
 def build_wave_labels(routes: List[dict]) -> dict:
-    times_sorted = sorted({r.get("wave_time", "") for r in routes if r.get("wave_time", "")}, key=lambda x: _time_to_minutes(x) or 10**9)
+    times_sorted = _wave_times_in_order(routes)
     suffix = {1: "st", 2: "nd", 3: "rd"}
     out = {}
     for i, t in enumerate(times_sorted, start=1):
@@ -694,6 +833,7 @@ input{min-width:140px;flex:1 1 auto;width:auto}
 .toteCard.dragging{opacity:.25;}
 .toteCard.dropTarget{outline:2px dashed rgba(90,170,255,.85); outline-offset:2px;}
 .toteCard.loaded{filter:grayscale(.85) brightness(.72);}
+.toteCard.hidden{display:none}
 .toteSlot{
   border:0;
   border-radius:18px;
@@ -1245,7 +1385,26 @@ const CUSTOM_SLOTS_KEY = "vanorg_custom_slots_v1";
 const LAST_MODE_KEY = "vanorg_last_bagmode_v1";
 
 function readJSON(key, fallback){ try { return JSON.parse(localStorage.getItem(key) || JSON.stringify(fallback)); } catch(e){ return fallback; } }
-function writeJSON(key, obj){ try { localStorage.setItem(key, JSON.stringify(obj)); } catch(e){} }
+// The in-memory objects below are authoritative; writes are coalesced so a burst of
+// toggles or a drag reorder serializes each key once, and flushed when the page hides.
+const PENDING_WRITES = new Map();
+let writeHandle = 0;
+function flushWrites(){
+  writeHandle = 0;
+  for (const [key, obj] of PENDING_WRITES){
+    try { localStorage.setItem(key, JSON.stringify(obj)); } catch(e){}
+  }
+  PENDING_WRITES.clear();
+}
+function writeJSON(key, obj){
+  PENDING_WRITES.set(key, obj);
+  if (writeHandle) return;
+  writeHandle = window.requestIdleCallback
+    ? requestIdleCallback(flushWrites, { timeout: 200 })
+    : setTimeout(flushWrites, 50);
+}
+window.addEventListener("pagehide", flushWrites);
+document.addEventListener("visibilitychange", ()=>{ if (document.hidden) flushWrites(); });
 
 let LOADED = readJSON(STORAGE_KEY, {});
 let BAGMODE = readJSON(MODE_KEY, {});
@@ -1682,12 +1841,18 @@ function parseZoneCounts(zones){
       return { zone: p, count: 0 };
     });
 }
+function searchTokens(q){
+  return q ? String(q).toLowerCase().split(/\s+/).filter(Boolean) : [];
+}
+
+function matchTokens(hayLc, tokens){
+  return tokens.every(t=>hayLc.includes(t));
+}
+
 function match(text,q){
-  if(!q) return true;
-  const tokens = String(q).toLowerCase().split(/\s+/).filter(Boolean);
+  const tokens = searchTokens(q);
   if(!tokens.length) return true;
-  const hay = (text||"").toLowerCase();
-  return tokens.every(t=>hay.includes(t));
+  return matchTokens((text||"").toLowerCase(), tokens);
 }
 
 function bagLabel(entry){
@@ -1781,8 +1946,21 @@ function normalizeCustomSlots(routeShort, items){
   return normalized;
 }
 
+// String keys of a route's base order, kept per route: bags_detail never changes at
+// runtime, so every buildOrder() after the first reuses the same Set.
+const BASE_KEY_SETS = {};
+function baseKeySet(routeShort, base){
+  const cached = BASE_KEY_SETS[routeShort];
+  if(cached && cached.base.length === base.length && cached.base.every((v, i)=>v === base[i])){
+    return cached.keys;
+  }
+  const keys = new Set(base.map(String));
+  BASE_KEY_SETS[routeShort] = { base: base.slice(), keys };
+  return keys;
+}
+
 function customOrderFromSlots(routeShort, baseOrderArr){
-  const baseSet = new Set(baseOrderArr.map(String));
+  const baseSet = baseKeySet(routeShort, baseOrderArr);
   const seen = new Set();
   const order = [];
   getCustomSlots(routeShort).forEach((slot)=>{
@@ -1802,14 +1980,27 @@ function customOrderFromSlots(routeShort, baseOrderArr){
 }
 
 function getCustomOrder(routeShort, base){
-  const arr = (BAGORDER[routeShort] || []).slice();
-  const baseSet = new Set(base.map(String));
-  const cleaned = arr.map(String).filter(x=>baseSet.has(x));
-  const cleanedSet = new Set(cleaned);
-  base.forEach(i=>{ const s=String(i); if(!cleanedSet.has(s)) cleaned.push(s); });
-  BAGORDER[routeShort] = cleaned.map(x=>parseInt(x,10));
+  const arr = BAGORDER[routeShort] || [];
+  const baseSet = baseKeySet(routeShort, base);
+  const seen = new Set();
+  const order = [];
+  arr.forEach((x)=>{
+    const key = String(x);
+    if(!baseSet.has(key) || seen.has(key)) return;
+    seen.add(key);
+    order.push(parseInt(key, 10));
+  });
+  base.forEach((idx)=>{
+    const key = String(idx);
+    if(seen.has(key)) return;
+    seen.add(key);
+    order.push(parseInt(key, 10));
+  });
+  // Only persist when the cleanup actually changed the saved order.
+  if(order.length === arr.length && order.every((v, i)=>v === arr[i])) return arr;
+  BAGORDER[routeShort] = order;
   writeJSON(ORDER_KEY, BAGORDER);
-  return BAGORDER[routeShort];
+  return order;
 }
 function setCustomOrder(routeShort, orderArr){ BAGORDER[routeShort] = orderArr.map(x=>parseInt(x,10)); writeJSON(ORDER_KEY, BAGORDER); }
 
@@ -1835,10 +2026,22 @@ function buildOrder(r){
   return buildOrderForMode(r, mode);
 }
 
+// Lowercased search fields of one bag record. Route data never changes after load,
+// so this is built on first use and reused by every later render and search.
+function bagSearchLc(bag, ovMap){
+  if(bag._searchLc === undefined){
+    const label = bag.bag_id || bag.label || bag.bag;
+    const overflow = overflowSearchText(bag.bag || label, ovMap);
+    bag._searchLc = `${label} ${bag.bag||""} ${bag.sort_zone||""} ${normZone(bag.sort_zone)} ${bag.pkgs||""} ${overflow}`.toLowerCase();
+  }
+  return bag._searchLc;
+}
+
 function buildDisplayItems(r, q, ovMap){
   const routeShort = r.route_short;
   const byIdx = Object.fromEntries((r.bags_detail||[]).map(x=>[x.idx, x]));
   const ord = buildOrder(r);
+  const tokens = searchTokens(q);
   const items = [];
   for(const idx of ord){
     if(isCombinedSecond(routeShort, idx)) continue;
@@ -1848,16 +2051,9 @@ function buildDisplayItems(r, q, ovMap){
     const second = isCombinedSecond(routeShort, secondIdx) ? byIdx[secondIdx] : null;
     const eligibleCombine = (!cur.sort_zone) && idx > 1;
     // IMPORTANT: combined cards use bag_id as the tote/bag key; label/bag may be missing
-    const curLabel = cur.bag_id || cur.label || cur.bag;
-    const secondLabel = second && (second.bag_id || second.label || second.bag);
-    const curOverflow = overflowSearchText(cur.bag || curLabel, ovMap);
-    const secondOverflow = overflowSearchText((second && second.bag) || secondLabel, ovMap);
-    const curSort = normZone(cur.sort_zone);
-    const secondSort = second ? normZone(second.sort_zone) : "";
-    const text = `${cur.idx} ${curLabel} ${cur.bag||""} ${cur.sort_zone||""} ${curSort} ${cur.pkgs||""} ${curOverflow}` +
-      (second ? ` ${secondLabel} ${second.bag||""} ${second.sort_zone||""} ${secondSort} ${second.pkgs||""} ${secondOverflow}` : "");
-    if(!match(text, q)) continue;
-    items.push({ idx, cur, secondIdx: second ? secondIdx : null, second, eligibleCombine });
+    const search = `${cur.idx} ${bagSearchLc(cur, ovMap)}` + (second ? ` ${bagSearchLc(second, ovMap)}` : "");
+    if(!matchTokens(search, tokens)) continue;
+    items.push({ idx, cur, secondIdx: second ? secondIdx : null, second, eligibleCombine, search });
   }
   return items;
 }
@@ -1875,81 +2071,110 @@ function combinedPkgSum(anchor, other){
   return String((first || 0) + (second || 0));
 }
 
-function buildToteCardHtml(it, routeShort, getSubLine, getBadgeText, getPkgCount, slotIndex){
+// Tote cards are cloned from one parsed <template> per variant and filled in place,
+// so a render never reparses card markup.
+const TOTE_CARD_TEMPLATES = {};
+function toteCardTemplate(kind){
+  let tpl = TOTE_CARD_TEMPLATES[kind];
+  if(!tpl){
+    const bigNumber = kind === "double"
+      ? `<div class="toteBigNumber toteBigNumberStack"><div class="toteBigNumberLine"></div><div class="toteBigNumberLine"></div></div>`
+      : `<div class="toteBigNumber"></div>`;
+    const minus = kind === "double"
+      ? `<div class="toteStar on" data-action="uncombine" title="Uncombine">-</div>`
+      : ``;
+    tpl = document.createElement("template");
+    tpl.innerHTML = `<div class="toteCard">
+      ${minus}
+      <div class="toteTopRow">
+        <div class="toteBadgeGroup"><div class="toteCornerBadge toteBubble"></div><div class="toteStar combine toteBubble" data-action="combine" title="Combine with previous">+</div></div>
+        <div class="card-bar">
+          <div class="bar-track"><div class="bar-fill"></div></div>
+        </div>
+        <div class="toteRightBadge"><div class="totePkg toteBubble"></div></div>
+      </div>
+      ${bigNumber}
+      <div class="toteBottomRow toteFooter"><div class="toteBottomCol toteBottomLeft"></div><div class="toteBottomCol toteBottomCenter"></div><div class="toteBottomCol toteBottomRight"></div></div>
+    </div>`;
+    TOTE_CARD_TEMPLATES[kind] = tpl;
+  }
+  return tpl.content.firstElementChild;
+}
+
+function buildToteCard(it, routeShort, getSubLine, getBadgeText, getPkgCount, slotIndex){
   const cur = it.cur;
   const second = it.second;
   const main1 = (cur.bag_id || cur.bag || "").toString();
   const chip1 = bagColorChip(cur.bag);
-  const loadedClass = isLoaded(routeShort, it.idx) ? "loaded" : "";
   const badgeText = getBadgeText ? getBadgeText(cur, second, it.idx) : it.idx;
   const pkgText = getPkgCount ? getPkgCount(cur, second) : "";
-  const badgeHtml = badgeText
-    ? `<div class="toteCornerBadge toteBubble">${badgeText}</div>`
-    : ``;
-  const pkgHtml = pkgText ? `<div class="totePkg toteBubble">${pkgText}</div>` : ``;
-  const pkgClass = pkgText ? "hasPkg" : "";
-  const sortZoneClass = cur.sort_zone ? "" : "noSortZone";
-  const starHtml = it.eligibleCombine ? `<div class="toteStar combine toteBubble" data-action="combine" data-second="${it.idx}" title="Combine with previous">+</div>` : ``;
-  const badgeGroupHtml = `<div class="toteBadgeGroup">${badgeHtml}${starHtml}</div>`;
-  const barHtml = `<div class="card-bar">
-    <div class="bar-track"><div class="bar-fill"></div></div>
-  </div>`;
-  const rightBadgeHtml = `<div class="toteRightBadge">${pkgHtml}</div>`;
-  const slotAttr = (slotIndex === 0 || slotIndex) ? ` data-slot="${slotIndex}"` : "";
+  const card = toteCardTemplate(second ? "double" : "single").cloneNode(true);
+
+  if(isLoaded(routeShort, it.idx)) card.classList.add("loaded");
+  if(pkgText) card.classList.add("hasPkg");
+  if(!cur.sort_zone) card.classList.add("noSortZone");
+  card.setAttribute("data-idx", it.idx);
+  card.dataset.search = it.search;
+  if(slotIndex === 0 || slotIndex) card.setAttribute("data-slot", slotIndex);
+
+  const badge = card.querySelector(".toteCornerBadge");
+  if(badgeText) badge.textContent = badgeText;
+  else badge.remove();
+  const star = card.querySelector('[data-action="combine"]');
+  if(it.eligibleCombine) star.setAttribute("data-second", it.idx);
+  else star.remove();
+  const pkg = card.querySelector(".totePkg");
+  if(pkgText) pkg.textContent = pkgText;
+  else pkg.remove();
+
+  let chip2 = chip1;
+  let sub = "";
   if(second){
     const main2 = (second.bag_id || second.bag || "").toString();
-    const chip2 = bagColorChip(second.bag);
-    const sub = getSubLine(cur, second);
-    const topNum = (cur.sort_zone ? main1 : main2);
-    const botNum = (cur.sort_zone ? main2 : main1);
-    const minusHtml = `<div class="toteStar on" data-action="uncombine" data-second="${it.secondIdx}" title="Uncombine">-</div>`;
-    const chipBorder = chipBorderColor(chip1, chip2);
-    return `<div class="toteCard ${loadedClass} ${pkgClass} ${sortZoneClass}" data-idx="${it.idx}"${slotAttr} style="--chipL:${chip1};--chipR:${chip2};--chipBorder:${chipBorder};">
-      ${minusHtml}
-      <div class="toteTopRow">
-        ${badgeGroupHtml}
-        ${barHtml}
-        ${rightBadgeHtml}
-      </div>
-      <div class="toteBigNumber toteBigNumberStack">
-        <div class="toteBigNumberLine">${topNum}</div>
-        <div class="toteBigNumberLine">${botNum}</div>
-      </div>
-      ${sub ? `<div class="toteBottomRow toteFooter"><div class="toteBottomCol toteBottomLeft"></div><div class="toteBottomCol toteBottomCenter">${sub}</div><div class="toteBottomCol toteBottomRight"></div></div>` : ``}
-    </div>`;
+    chip2 = bagColorChip(second.bag);
+    sub = getSubLine(cur, second);
+    const lines = card.querySelectorAll(".toteBigNumberLine");
+    lines[0].textContent = cur.sort_zone ? main1 : main2;
+    lines[1].textContent = cur.sort_zone ? main2 : main1;
+    card.querySelector('[data-action="uncombine"]').setAttribute("data-second", it.secondIdx);
+  }else{
+    sub = getSubLine(cur, null);
+    card.querySelector(".toteBigNumber").textContent = main1;
   }
+  card.style.setProperty("--chipL", chip1);
+  card.style.setProperty("--chipR", chip2);
+  card.style.setProperty("--chipBorder", chipBorderColor(chip1, chip2));
 
-  const sub = getSubLine(cur, null);
-  const chipBorder = chipBorderColor(chip1, chip1);
-  return `<div class="toteCard ${loadedClass} ${pkgClass} ${sortZoneClass}" data-idx="${it.idx}"${slotAttr} style="--chipL:${chip1};--chipR:${chip1};--chipBorder:${chipBorder};">
-    <div class="toteTopRow">
-      ${badgeGroupHtml}
-      ${barHtml}
-      ${rightBadgeHtml}
-    </div>
-    <div class="toteBigNumber">${main1}</div>
-    ${sub ? `<div class="toteBottomRow toteFooter"><div class="toteBottomCol toteBottomLeft"></div><div class="toteBottomCol toteBottomCenter">${sub}</div><div class="toteBottomCol toteBottomRight"></div></div>` : ``}
-  </div>`;
+  const footer = card.querySelector(".toteFooter");
+  // Sub lines may carry markup (overflow zone lines), so they stay HTML.
+  if(sub) footer.querySelector(".toteBottomCenter").innerHTML = sub;
+  else footer.remove();
+  return card;
 }
 
 function buildToteLayout(items, routeShort, getSubLine, getBadgeText, getPkgCount){
-  const orderedItems = items.slice();
-  const cardsHtml = orderedItems.map((it)=>{
-    return buildToteCardHtml(it, routeShort, getSubLine, getBadgeText, getPkgCount, null);
-  }).join("");
-
-  return { cardsHtml };
+  const cards = document.createDocumentFragment();
+  items.forEach((it)=>{
+    cards.appendChild(buildToteCard(it, routeShort, getSubLine, getBadgeText, getPkgCount, null));
+  });
+  return { cards };
 }
 
 function buildCustomSlotsLayout(routeShort, slots, itemsById, getSubLine, getBadgeText, getPkgCount){
-  const cardsHtml = slots.map((slot, index)=>{
+  const cards = document.createDocumentFragment();
+  slots.forEach((slot, index)=>{
     if(!slot || !itemsById.has(slot)){
-      return `<div class="toteSlot" data-slot="${index}" aria-label="Empty slot"></div>`;
+      const empty = document.createElement("div");
+      empty.className = "toteSlot";
+      empty.setAttribute("data-slot", index);
+      empty.setAttribute("aria-label", "Empty slot");
+      cards.appendChild(empty);
+      return;
     }
     const item = itemsById.get(slot);
-    return buildToteCardHtml(item, routeShort, getSubLine, getBadgeText, getPkgCount, index);
-  }).join("");
-  return { cardsHtml };
+    cards.appendChild(buildToteCard(item, routeShort, getSubLine, getBadgeText, getPkgCount, index));
+  });
+  return { cards };
 }
 
 function buildOverflowMap(r){
@@ -1981,49 +2206,18 @@ function overflowSummary(bagLabel, ovMap){
 }
 
 
+// Card, checkbox and row events are delegated from #content, which outlives every
+// render; a render only records the state those handlers read below.
+const BAG_EVENTS = { routeShort: "", items: [], drag: false, dragSlot: null };
+const OV_EVENTS = { routeShort: "", drag: false, dragId: null };
+
 function attachBagHandlers(routeShort, allowDrag, customState){
   const hasCustomSlots = customState && customState.mode === "custom";
   const items = customState ? customState.items || [] : [];
-  // click to mark loaded (ignore star clicks)
-  document.querySelectorAll('.toteCard[data-idx]').forEach(el=>{
-    el.addEventListener('click', (e)=>{
-      if(e.target && e.target.classList && e.target.classList.contains('toteStar')) return;
-      if(el.classList.contains('dragging')) return;
-      const idx = parseInt(el.getAttribute('data-idx')||"0",10);
-      if(!idx) return;
-      toggleLoaded(routeShort, idx);
-      el.classList.toggle('loaded', isLoaded(routeShort, idx));
-      const r = ROUTES[activeRouteIndex];
-      if(r){
-        updateFooterCounts(r);
-        sendMetaToParent(r);
-      }
-    });
-  });
-
-  // combine/uncombine
-  document.querySelectorAll('.toteStar[data-action]').forEach(btn=>{
-    btn.addEventListener('click', (e)=>{
-      e.preventDefault(); e.stopPropagation();
-      const act = btn.getAttribute('data-action');
-      const second = parseInt(btn.getAttribute('data-second')||"0",10);
-      if(!second) return;
-      const r = ROUTES[activeRouteIndex];
-      const base = baseOrder(r);
-
-      if(act==="combine"){
-        setCombined(routeShort, second, true);
-      } else if(act==="uncombine"){
-        setCombined(routeShort, second, false);
-      }
-      if(getMode(routeShort)==="custom"){
-        const ord = customOrderFromSlots(routeShort, base);
-        setCustomOrder(routeShort, ord);
-        normalizeCustomSlots(routeShort, items);
-      }
-      render();
-    });
-  });
+  BAG_EVENTS.routeShort = routeShort;
+  BAG_EVENTS.items = items;
+  BAG_EVENTS.drag = !!(allowDrag && hasCustomSlots);
+  BAG_EVENTS.dragSlot = null;
 
   // clear loaded
   const btn = document.getElementById('clearLoadedBtn');
@@ -2078,73 +2272,83 @@ function attachBagHandlers(routeShort, allowDrag, customState){
   });
 
   // drag/drop for custom: swap slots
-  if(!allowDrag) return;
-  if(!hasCustomSlots){
-    return;
-  }
-  let dragSlot = null;
-
-  document.querySelectorAll('.toteCard[data-slot]').forEach(el=>{
+  if(!BAG_EVENTS.drag) return;
+  content.querySelectorAll('.toteCard[data-slot]').forEach(el=>{
     el.setAttribute('draggable', 'true');
     el.classList.add('draggable');
+  });
+}
 
-    el.addEventListener('dragstart', (e)=>{
-      dragSlot = el.getAttribute('data-slot');
-      el.classList.add('dragging');
-      try { e.dataTransfer.setData('text/plain', dragSlot); } catch(_) {}
-      e.dataTransfer.effectAllowed = 'move';
-    });
+// click to mark loaded
+function onToteCardClick(el){
+  if(el.classList.contains('dragging')) return;
+  const routeShort = BAG_EVENTS.routeShort;
+  const idx = parseInt(el.getAttribute('data-idx')||"0",10);
+  if(!idx) return;
+  toggleLoaded(routeShort, idx);
+  el.classList.toggle('loaded', isLoaded(routeShort, idx));
+  const r = ROUTES[activeRouteIndex];
+  if(r){
+    updateFooterCounts(r);
+    sendMetaToParent(r);
+  }
+}
 
-    el.addEventListener('dragend', ()=>{
-      dragSlot = null;
-      document.querySelectorAll('[data-slot]').forEach(x=>x.classList.remove('dragging','dropTarget'));
-    });
-  });
+// combine/uncombine
+function onToteStarClick(btn){
+  const routeShort = BAG_EVENTS.routeShort;
+  const act = btn.getAttribute('data-action');
+  const second = parseInt(btn.getAttribute('data-second')||"0",10);
+  if(!second) return;
+  const r = ROUTES[activeRouteIndex];
+  const base = baseOrder(r);
 
-  document.querySelectorAll('[data-slot]').forEach(el=>{
-    el.addEventListener('dragover', (e)=>{
-      e.preventDefault();
-      el.classList.add('dropTarget');
-      e.dataTransfer.dropEffect = 'move';
-    });
+  if(act==="combine"){
+    setCombined(routeShort, second, true);
+  } else if(act==="uncombine"){
+    setCombined(routeShort, second, false);
+  }
+  if(getMode(routeShort)==="custom"){
+    const ord = customOrderFromSlots(routeShort, base);
+    setCustomOrder(routeShort, ord);
+    normalizeCustomSlots(routeShort, BAG_EVENTS.items);
+  }
+  render();
+}
 
-    el.addEventListener('dragleave', ()=>{ el.classList.remove('dropTarget'); });
-
-    el.addEventListener('drop', (e)=>{
-      e.preventDefault();
-      el.classList.remove('dropTarget');
-      const targetSlot = el.getAttribute('data-slot');
-      const src = dragSlot || (function(){ try { return e.dataTransfer.getData('text/plain'); } catch(_){ return null; } })();
-      if(src === null || src === undefined || targetSlot === null || targetSlot === undefined) return;
-      if(src === targetSlot) return;
-
-      const from = parseInt(src, 10);
-      const to = parseInt(targetSlot, 10);
-      if(Number.isNaN(from) || Number.isNaN(to)) return;
-
-      const slots = normalizeCustomSlots(routeShort, items);
-      const updated = slots.slice();
-      if(from < 0 || to < 0 || from >= updated.length || to >= updated.length) return;
-      const fromValue = updated[from];
-      if(fromValue === null || fromValue === undefined) return;
-      if(from < to){
-        for(let i = from; i < to; i++){
-          updated[i] = updated[i + 1];
-        }
-        updated[to] = fromValue;
-      }else if(from > to){
-        for(let i = from; i > to; i--){
-          updated[i] = updated[i - 1];
-        }
-        updated[to] = fromValue;
-      }
-      setCustomSlots(routeShort, updated);
-      normalizeCustomSlots(routeShort, items);
-      setMode(routeShort, "custom");
-      clearResetArmed(routeShort);
-      render();
-    });
-  });
+function onToteSlotDrop(el, e){
+  const routeShort = BAG_EVENTS.routeShort;
+  const items = BAG_EVENTS.items;
+  const targetSlot = el.getAttribute('data-slot');
+  const src = BAG_EVENTS.dragSlot || (function(){ try { return e.dataTransfer.getData('text/plain'); } catch(_){ return null; } })();
+  if(src === null || src === undefined || targetSlot === null || targetSlot === undefined) return;
+  if(src === targetSlot) return;
+
+  const from = parseInt(src, 10);
+  const to = parseInt(targetSlot, 10);
+  if(Number.isNaN(from) || Number.isNaN(to)) return;
+
+  const slots = normalizeCustomSlots(routeShort, items);
+  const updated = slots.slice();
+  if(from < 0 || to < 0 || from >= updated.length || to >= updated.length) return;
+  const fromValue = updated[from];
+  if(fromValue === null || fromValue === undefined) return;
+  if(from < to){
+    for(let i = from; i < to; i++){
+      updated[i] = updated[i + 1];
+    }
+    updated[to] = fromValue;
+  }else if(from > to){
+    for(let i = from; i > to; i--){
+      updated[i] = updated[i - 1];
+    }
+    updated[to] = fromValue;
+  }
+  setCustomSlots(routeShort, updated);
+  normalizeCustomSlots(routeShort, items);
+  setMode(routeShort, "custom");
+  clearResetArmed(routeShort);
+  render();
 }
 
 
@@ -2184,6 +2388,10 @@ function buildOverflowSyncOrder(r){
 }
 
 function attachOverflowHandlers(routeShort, allowDrag, r){
+  OV_EVENTS.routeShort = routeShort;
+  OV_EVENTS.drag = !!allowDrag;
+  OV_EVENTS.dragId = null;
+
   // mode toggle
   document.querySelectorAll('[data-ovmode]').forEach(btn=>{
     btn.addEventListener('click', ()=>{
@@ -2204,21 +2412,6 @@ function attachOverflowHandlers(routeShort, allowDrag, r){
     });
   }
 
-  // checkbox toggles (click + keyboard)
-  document.querySelectorAll('.ovBox[data-rowid][data-k]').forEach(box=>{
-    const fire = ()=>{
-      const rowId = box.getAttribute('data-rowid');
-      const k = parseInt(box.getAttribute('data-k')||"0",10);
-      if(!rowId || !k) return;
-      toggleOvChecked(routeShort, rowId, k);
-      render();
-    };
-    box.addEventListener('click', (e)=>{ e.preventDefault(); e.stopPropagation(); fire(); });
-    box.addEventListener('keydown', (e)=>{
-      if(e.key === "Enter" || e.key === " "){ e.preventDefault(); fire(); }
-    });
-  });
-
   // clear overflow checks for this route only
   const ovClear = document.getElementById('ovClear');
   if(ovClear){
@@ -2228,56 +2421,152 @@ function attachOverflowHandlers(routeShort, allowDrag, r){
       render();
     });
   }
+}
 
-  if(!allowDrag) return;
+// checkbox toggles (click + keyboard)
+function onOvBoxFire(box){
+  const rowId = box.getAttribute('data-rowid');
+  const k = parseInt(box.getAttribute('data-k')||"0",10);
+  if(!rowId || !k) return;
+  toggleOvChecked(OV_EVENTS.routeShort, rowId, k);
+  render();
+}
 
-  // drag reorder rows (custom mode)
-  let dragId = null;
-  document.querySelectorAll('tr.ovDrag[data-rowid]').forEach(tr=>{
-    tr.addEventListener('dragstart', (e)=>{
-      dragId = tr.getAttribute('data-rowid');
-      tr.classList.add('dragging');
-      try{ e.dataTransfer.setData('text/plain', dragId); }catch(_){}
-      e.dataTransfer.effectAllowed = 'move';
-    });
-    tr.addEventListener('dragend', ()=>{
-      dragId = null;
-      document.querySelectorAll('tr.ovDrag').forEach(x=>x.classList.remove('dragging','dropTarget'));
-    });
-    tr.addEventListener('dragover', (e)=>{
-      e.preventDefault();
-      tr.classList.add('dropTarget');
-      e.dataTransfer.dropEffect = 'move';
-    });
-    tr.addEventListener('dragleave', ()=>tr.classList.remove('dropTarget'));
-    tr.addEventListener('drop', (e)=>{
-      e.preventDefault();
-      tr.classList.remove('dropTarget');
-      const targetId = tr.getAttribute('data-rowid');
-      const srcId = dragId || (function(){ try{ return e.dataTransfer.getData('text/plain'); }catch(_){ return null; } })();
-      if(!srcId || !targetId || srcId === targetId) return;
-
-      // Build current ordered ids from DOM
-      const ids = Array.from(document.querySelectorAll('tr.ovDrag[data-rowid]')).map(x=>x.getAttribute('data-rowid'));
-      const from = ids.indexOf(srcId);
-      const to = ids.indexOf(targetId);
-      if(from === -1 || to === -1) return;
-      ids.splice(from,1);
-      ids.splice(to,0,srcId);
-      setOvOrder(routeShort, ids);
-      setOvMode(routeShort, "custom");
-      render();
-    });
-  });
+// drag reorder rows (custom mode)
+function onOvRowDrop(tr, e){
+  const routeShort = OV_EVENTS.routeShort;
+  const targetId = tr.getAttribute('data-rowid');
+  const srcId = OV_EVENTS.dragId || (function(){ try{ return e.dataTransfer.getData('text/plain'); }catch(_){ return null; } })();
+  if(!srcId || !targetId || srcId === targetId) return;
+
+  // Build current ordered ids from DOM
+  const ids = Array.from(document.querySelectorAll('tr.ovDrag[data-rowid]')).map(x=>x.getAttribute('data-rowid'));
+  const from = ids.indexOf(srcId);
+  const to = ids.indexOf(targetId);
+  if(from === -1 || to === -1) return;
+  ids.splice(from,1);
+  ids.splice(to,0,srcId);
+  setOvOrder(routeShort, ids);
+  setOvMode(routeShort, "custom");
+  render();
 }
 
+// Element an event landed on; drag events can target the text node under the pointer.
+function eventTarget(e){
+  const t = e.target;
+  return t && t.nodeType === 1 ? t : (t && t.parentElement) || null;
+}
+
+function closestIn(e, selector){
+  const t = eventTarget(e);
+  return t ? t.closest(selector) : null;
+}
+
+// Drag sources and drop targets for whichever board is showing: tote slots on the
+// bags/combined tabs, overflow rows on the overflow tab.
+function dragCardFrom(e){
+  return BAG_EVENTS.drag ? closestIn(e, '.toteCard[data-slot]') : null;
+}
+function dropSlotFrom(e){
+  return BAG_EVENTS.drag ? closestIn(e, '[data-slot]') : null;
+}
+function dragRowFrom(e){
+  return OV_EVENTS.drag ? closestIn(e, 'tr.ovDrag[data-rowid]') : null;
+}
+
+content.addEventListener('click', (e)=>{
+  const star = closestIn(e, '.toteStar[data-action]');
+  if(star){
+    e.preventDefault(); e.stopPropagation();
+    onToteStarClick(star);
+    return;
+  }
+  const card = closestIn(e, '.toteCard[data-idx]');
+  if(card){
+    onToteCardClick(card);
+    return;
+  }
+  const box = closestIn(e, '.ovBox[data-rowid][data-k]');
+  if(box){
+    e.preventDefault(); e.stopPropagation();
+    onOvBoxFire(box);
+  }
+});
+
+content.addEventListener('keydown', (e)=>{
+  if(e.key !== "Enter" && e.key !== " ") return;
+  const box = closestIn(e, '.ovBox[data-rowid][data-k]');
+  if(!box) return;
+  e.preventDefault();
+  onOvBoxFire(box);
+});
+
+content.addEventListener('dragstart', (e)=>{
+  const card = dragCardFrom(e);
+  if(card){
+    BAG_EVENTS.dragSlot = card.getAttribute('data-slot');
+    card.classList.add('dragging');
+    try { e.dataTransfer.setData('text/plain', BAG_EVENTS.dragSlot); } catch(_) {}
+    e.dataTransfer.effectAllowed = 'move';
+    return;
+  }
+  const tr = dragRowFrom(e);
+  if(tr){
+    OV_EVENTS.dragId = tr.getAttribute('data-rowid');
+    tr.classList.add('dragging');
+    try{ e.dataTransfer.setData('text/plain', OV_EVENTS.dragId); }catch(_){}
+    e.dataTransfer.effectAllowed = 'move';
+  }
+});
+
+content.addEventListener('dragend', (e)=>{
+  if(dragCardFrom(e)){
+    BAG_EVENTS.dragSlot = null;
+    document.querySelectorAll('[data-slot]').forEach(x=>x.classList.remove('dragging','dropTarget'));
+    return;
+  }
+  if(dragRowFrom(e)){
+    OV_EVENTS.dragId = null;
+    document.querySelectorAll('tr.ovDrag').forEach(x=>x.classList.remove('dragging','dropTarget'));
+  }
+});
+
+content.addEventListener('dragover', (e)=>{
+  const el = dropSlotFrom(e) || dragRowFrom(e);
+  if(!el) return;
+  e.preventDefault();
+  el.classList.add('dropTarget');
+  e.dataTransfer.dropEffect = 'move';
+});
+
+content.addEventListener('dragleave', (e)=>{
+  const el = dropSlotFrom(e) || dragRowFrom(e);
+  if(el) el.classList.remove('dropTarget');
+});
+
+content.addEventListener('drop', (e)=>{
+  const slot = dropSlotFrom(e);
+  if(slot){
+    e.preventDefault();
+    slot.classList.remove('dropTarget');
+    onToteSlotDrop(slot, e);
+    return;
+  }
+  const tr = dragRowFrom(e);
+  if(tr){
+    e.preventDefault();
+    tr.classList.remove('dropTarget');
+    onOvRowDrop(tr, e);
+  }
+});
+
   function renderBags(r, q){
     const routeShort = r.route_short;
     const mode = getMode(routeShort);
 
     const ovMap = buildOverflowMap(r);
     const allItems = buildDisplayItems(r, "", ovMap);
-    const items = q ? buildDisplayItems(r, q, ovMap) : allItems;
+    const items = (q && mode === "custom") ? buildDisplayItems(r, q, ovMap) : allItems;
 
   function subLine(anchor, other){
     const src = anchor.sort_zone ? anchor : (other && other.sort_zone ? other : anchor);
@@ -2307,7 +2596,7 @@ function attachOverflowHandlers(routeShort, allowDrag, r){
   content.innerHTML = `
     <div class="toteGridFrame">
       <div class="toteWrap">
-        <div class="toteBoard bagsGrid">${layout.cardsHtml}</div>
+        <div class="toteBoard bagsGrid"></div>
       </div>
     </div>
     <div class="bagFooter">
@@ -2330,6 +2619,8 @@ function attachOverflowHandlers(routeShort, allowDrag, r){
       </div>
     </div>
   `;
+  content.querySelector(".toteBoard").replaceChildren(layout.cards);
+  if(mode !== "custom") applyFilter(q);
 
   const allowDrag = (mode === "custom") && !q;
   attachBagHandlers(routeShort, allowDrag, { mode, slots, items: allItems });
@@ -2446,7 +2737,7 @@ function renderCombined(r,q){
   const mode = getMode(routeShort);
   const ovMap = buildOverflowMap(r);
   const allItems = buildDisplayItems(r, "", ovMap);
-  const items = q ? buildDisplayItems(r, q, ovMap) : allItems;
+  const items = (q && mode === "custom") ? buildDisplayItems(r, q, ovMap) : allItems;
 
   function combinedBadgeText(anchor, other){
     const src = anchor.sort_zone ? anchor : (other && other.sort_zone ? other : anchor);
@@ -2481,7 +2772,7 @@ function renderCombined(r,q){
   content.innerHTML = `
     <div class="toteGridFrame">
       <div class="toteWrap">
-        <div class="toteBoard bagsGrid">${layout.cardsHtml}</div>
+        <div class="toteBoard bagsGrid"></div>
       </div>
     </div>
     <div class="bagFooter">
@@ -2504,6 +2795,8 @@ function renderCombined(r,q){
       </div>
     </div>
   `;
+  content.querySelector(".toteBoard").replaceChildren(layout.cards);
+  if(mode !== "custom") applyFilter(q);
 
   const allowDrag = (mode === "custom") && !q;
   attachBagHandlers(routeShort, allowDrag, { mode, slots, items: allItems });
@@ -2565,6 +2858,26 @@ function scrollTotesToRight(){
   }
 }
 
+// Outside custom mode every card is rendered and search only hides the misses, so a
+// keystroke toggles classes instead of rebuilding the board. Custom mode swaps misses
+// for empty slots and locks dragging while a query is set, so it still re-renders.
+function applyFilter(q){
+  const tokens = searchTokens(q);
+  content.querySelectorAll(".toteBoard .toteCard").forEach((card)=>{
+    card.classList.toggle("hidden", !matchTokens(card.dataset.search || "", tokens));
+  });
+}
+
+function onSearchInput(){
+  const r = ROUTES[activeRouteIndex];
+  if(r && (activeTab==="bags" || activeTab==="combined") && getMode(r.route_short) !== "custom"){
+    applyFilter(qBox.value.trim());
+    scrollTotesToRight();
+    return;
+  }
+  render();
+}
+
 function render(){
   const r = ROUTES[activeRouteIndex];
   if(!r){ content.innerHTML = "<div style='color:var(--muted)'>No routes found.</div>"; return; }
@@ -2698,7 +3011,7 @@ function init(){
     })
     .catch(()=>{});
 
-  qBox.addEventListener("input", ()=>render());
+  qBox.addEventListener("input", onSearchInput);
   if(organizerRoot && "ResizeObserver" in window){
     const ro = new ResizeObserver(()=>{
       scheduleRender();
@@ -2737,10 +3050,13 @@ window.addEventListener("message", (ev)=>{
     var grid = wrap && wrap.querySelector('.bagsGrid');
     if(!frame || !wrap || !grid) return;
 
-    var cards = Array.from(grid.children).filter(function(el){
+    var shown = Array.from(grid.children).filter(function(el){
+      return !(el.classList && el.classList.contains('hidden'));
+    });
+    var cards = shown.filter(function(el){
       return el.classList && el.classList.contains('toteCard');
     });
-    var total = grid.children.length || cards.length || 0;
+    var total = shown.length || cards.length || 0;
     var wrapRect = wrap.getBoundingClientRect();
     var availW = Math.max(0, wrapRect.width);
     var availH = Math.max(0, wrapRect.height);
@@ -2835,52 +3151,87 @@ window.addEventListener("message", (ev)=>{
 """
 
 
+# HTML_TEMPLATE split around its placeholders once, so build_html fills every slot in
+# a single join and no substituted value is ever rescanned for another placeholder.
+PAT_PLACEHOLDER = re.compile(r'__(HEADER_TITLE|HEADER_ROUTE_CODE|HEADER_ROUTE_DATE|HEADER_ROUTE_SEP|ROUTES_JSON|WAVE_JSON)__')
+_TEMPLATE_PARTS = PAT_PLACEHOLDER.split(HTML_TEMPLATE)
+
+
 def build_html(header_title: str, routes: List[dict], wave_map: dict) -> str:
-    # Keep JSON dumps settings identical to previous: no indent, ensure_ascii False.
-    routes_json = json.dumps(routes, ensure_ascii=False)
-    wave_json = json.dumps(wave_map, ensure_ascii=False)
+    # orjson writes the same JSON values as json.dumps(ensure_ascii=False), minus the spaces.
     route_code = header_title
     route_date = ""
     route_sep = ""
     if " • " in header_title:
         route_code, route_date = header_title.split(" • ", 1)
         route_sep = " • "
-    return (HTML_TEMPLATE
-            .replace("__HEADER_TITLE__", header_title)
-            .replace("__HEADER_ROUTE_CODE__", route_code)
-            .replace("__HEADER_ROUTE_DATE__", route_date)
-            .replace("__HEADER_ROUTE_SEP__", route_sep)
-            .replace("__ROUTES_JSON__", routes_json)
-            .replace("__WAVE_JSON__", wave_json))
+    subs = {
+        "HEADER_TITLE": header_title,
+        "HEADER_ROUTE_CODE": route_code,
+        "HEADER_ROUTE_DATE": route_date,
+        "HEADER_ROUTE_SEP": route_sep,
+        "ROUTES_JSON": orjson.dumps(routes).decode(),
+        "WAVE_JSON": orjson.dumps(wave_map).decode(),
+    }
+    parts = list(_TEMPLATE_PARTS)
+    parts[1::2] = [subs[name] for name in parts[1::2]]
+    return "".join(parts)
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--pdf", required=True, help="Route Sheets PDF")
-    ap.add_argument("--xlsx", required=True, help="Bags_with_Overflow Excel")
-    ap.add_argument("--out", required=True, help="Output HTML path")
-    ap.add_argument("--no-cache", action="store_true", help="Disable PDF parse cache")
-    args = ap.parse_args()
+def build_organizer(
+    pdf_path: str,
+    xlsx_path: str,
+    out_path: str,
+    no_cache: bool = False,
+    progress_cb: Optional[Callable[[str], None]] = None,
+    page_texts: Optional[List[str]] = None,
+) -> str:
+    """
+    Build the organizer HTML and write it to out_path. Importable entrypoint for the web app;
+    progress_cb, if given, receives a short step name as each phase starts, and page_texts
+    (per-page extract_text() output the caller already has) is passed to parse_pdf_meta.
+    """
+    def step(name: str) -> None:
+        if progress_cb:
+            progress_cb(name)
+
+    # Inputs may have changed since a previous build in this process.
+    _stat_tuple.cache_clear()
 
+    step("reading route sheets")
     header_title, _, pdf_meta, route_time, pkg_summary = parse_pdf_meta(
-        args.pdf,
-        use_cache=not args.no_cache,
+        pdf_path,
+        use_cache=not no_cache,
+        page_texts=page_texts,
     )
-    if args.no_cache:
-        routes = parse_excel_routes(args.xlsx, pdf_meta, route_time, pkg_summary)
+    step("matching bags")
+    if no_cache:
+        routes = parse_excel_routes(xlsx_path, pdf_meta, route_time, pkg_summary)
         wave_map = build_wave_labels(routes)
     else:
-        cached = _load_routes_cache(args.pdf, args.xlsx)
+        cached = _load_routes_cache(pdf_path, xlsx_path)
         if cached:
             routes = cached["routes"]
             wave_map = cached["wave_map"]
         else:
-            routes = parse_excel_routes(args.xlsx, pdf_meta, route_time, pkg_summary)
+            routes = parse_excel_routes(xlsx_path, pdf_meta, route_time, pkg_summary)
             wave_map = build_wave_labels(routes)
-            _save_routes_cache(args.pdf, args.xlsx, {"routes": routes, "wave_map": wave_map})
+            _save_routes_cache(pdf_path, xlsx_path, {"routes": routes, "wave_map": wave_map})
+    step("rendering")
     html = build_html(header_title, routes, wave_map)
-    Path(args.out).write_text(html, encoding="utf-8")
-    print(args.out)
+    Path(out_path).write_text(html, encoding="utf-8")
+    return out_path
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", required=True, help="Route Sheets PDF")
+    ap.add_argument("--xlsx", required=True, help="Bags_with_Overflow Excel")
+    ap.add_argument("--out", required=True, help="Output HTML path")
+    ap.add_argument("--no-cache", action="store_true", help="Disable PDF parse cache")
+    args = ap.parse_args()
+
+    print(build_organizer(args.pdf, args.xlsx, args.out, no_cache=args.no_cache))
 
 
 if __name__ == "__main__":
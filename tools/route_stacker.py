@@ -84,6 +84,11 @@ _WS_RE = re.compile(r"\s+")
 HEADER_RE = re.compile(r"\bsort\s+zone\s+(?:bag\s+)?pkgs?\b", re.I)
 STG_RE = re.compile(r"\bSTG\.([A-Z0-9]+(?:\.[A-Z0-9]+)*\.\d+)\b", re.I)  # Route/staging code after STG. (e.g., STG.ABC.12, STG.A1.B2.34).
 CX_RE  = re.compile(r"\b(?:CX|TX)\d{1,3}\b", re.I)
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_DECLARED_COUNTS_RE = re.compile(r"(\d+)\s+bags?\s+(\d+)\s+over")
+_SEMI_SPLIT_RE = re.compile(r";+")
+_HHMM_RE = re.compile(r"(\d{1,2}):(\d{2})")
+_NATURAL_PARTS_RE = re.compile(r"\d+|\D+")
 
 
 def _norm_line(s: str) -> str:
@@ -153,7 +158,7 @@ def is_zone(token: str) -> bool:
 
 def parse_int_safe(token, context: str = "", route_title: str = ""):
     s = str(token).strip()
-    cleaned = re.sub(r"[^\d]", "", s)
+    cleaned = _NON_DIGIT_RE.sub("", s)
     if cleaned == "":
         warn(f"Failed to parse int from {token!r} in {context} [{route_title}]")
         return None
@@ -166,7 +171,7 @@ def parse_int_safe(token, context: str = "", route_title: str = ""):
 def extract_bag_num_str(token, context: str = "", route_title: str = ""):
     # Preserve leading zeros
     s = str(token).strip()
-    digits = re.sub(r"[^\d]", "", s)
+    digits = _NON_DIGIT_RE.sub("", s)
     if digits == "":
         warn(f"Failed to parse bag number from {token!r} in {context} [{route_title}]")
         return None
@@ -203,7 +208,7 @@ def extract_declared_counts(lines, route_title: str = ""):
     for l in lines:
         if HEADER_RE.search(_norm_line(l)):
             break
-        m = re.search(r"(\d+)\s+bags?\s+(\d+)\s+over", l.lower())
+        m = _DECLARED_COUNTS_RE.search(l.lower())
         if m:
             bag_ct = parse_int_safe(m.group(1), "Declared bags", route_title)
             ov_ct = parse_int_safe(m.group(2), "Declared overflow", route_title)
@@ -459,13 +464,18 @@ def assign_overflows(bags, overs):
 # =========================
 # DATAFRAME
 # =========================
-def df_from(bags, texts, totals):
-    assert len(bags) == len(texts) == len(totals), "Length mismatch in df_from inputs"
+def rows_from(bags, texts, totals):
+    assert len(bags) == len(texts) == len(totals), "Length mismatch in rows_from inputs"
     rows = []
     for b, tags, tot in zip(bags, texts, totals):
         mid = "; ".join(tags)
         tot_disp = int(tot) if mid else ""  # blank if no overflow
         rows.append([b["bag"], mid, tot_disp])
+    return rows
+
+
+def df_from(bags, texts, totals):
+    rows = rows_from(bags, texts, totals)
     df = pd.DataFrame(rows, columns=["Bag", "Overflow Zone(s)", "Overflow Pkgs (total)"])
     df["Overflow Zone(s)"] = df["Overflow Zone(s)"].replace({np.nan: ""})
     return df
@@ -694,7 +704,7 @@ def draw_tote(df: pd.DataFrame, bags: list[dict[str, Any]], max_h: int | None =
         tile_w_i = tile_ws_for_items[i]
         cell = df.iat[i, 1]
         mid = "" if pd.isna(cell) else str(cell)
-        toks = [t.strip() for t in re.split(r";+", mid) if t.strip()]
+        toks = [t.strip() for t in _SEMI_SPLIT_RE.split(mid) if t.strip()]
         overflow_plans.append(plan_overflow_chips(_CHIP_D, toks, tile_w_i))
 
     if max_h is not None:
@@ -1078,7 +1088,7 @@ def render_table_scaled(
 
             # Overflow zones column
             elif c_idx == 1:
-                toks = [t.strip() for t in re.split(r";+", text) if t.strip()]
+                toks = [t.strip() for t in _SEMI_SPLIT_RE.split(text) if t.strip()]
                 if not toks:
                     cx += w
                     continue
@@ -1403,7 +1413,7 @@ def render_summary_pages(
 def _wave_label(time_label: str) -> str:
     if not time_label:
         return "Wave: ??:??"
-    m = re.search(r"(\d{1,2}):(\d{2})", str(time_label))
+    m = _HHMM_RE.search(str(time_label))
     if not m:
         return "Wave: ??:??"
     hh = int(m.group(1))
@@ -1445,7 +1455,7 @@ def render_toc_page(date_label: str, route_entries):
 
     def wave_sort_key(e):
         tl = e.get("time_label") or ""
-        m = re.search(r"(\d{1,2}):(\d{2})", tl)
+        m = _HHMM_RE.search(tl)
         if not m:
             return (999, 99, e.get("title", ""))
         return (int(m.group(1)), int(m.group(2)), e.get("title", ""))
@@ -1459,7 +1469,7 @@ def render_toc_page(date_label: str, route_entries):
 
     # Sort each wave section: alphabetical first, then numeric
     def _natural_key(s: str):
-        parts = re.findall(r"\d+|\D+", s)
+        parts = _NATURAL_PARTS_RE.findall(s)
         key = []
         for p in parts:
             if p.isdigit():
@@ -1739,7 +1749,8 @@ def _try_add_all_links(
 # =========================
 # MAIN BUILDER (Grouped + TOC + Summary)
 # =========================
-def build_stacked_pdf_with_summary_grouped(input_pdf: str, output_pdf: str, date_label: str, progress_cb=None):
+def build_stacked_pdf_with_summary_grouped(input_pdf: str, output_pdf: str, date_label: str, progress_cb=None, page_texts=None):
+    # page_texts: optional per-page extract_text() output the caller already has; skips re-extraction.
     # If caller doesn't provide a progress callback, write _job_status.json next to output_pdf.
     if progress_cb is None:
         out_dir = Path(output_pdf).resolve().parent
@@ -1803,8 +1814,9 @@ def build_stacked_pdf_with_summary_grouped(input_pdf: str, output_pdf: str, date
 
     _cb(0, 0, 0, "Reading", "Extracting text…")
 
-    with pdfplumber.open(input_pdf) as pdf:
-        page_texts = [(p.extract_text() or "") for p in pdf.pages]
+    if page_texts is None:
+        with pdfplumber.open(input_pdf) as pdf:
+            page_texts = [(p.extract_text() or "") for p in pdf.pages]
 
     groups = _group_pages(page_texts)
     if not groups: